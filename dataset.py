@@ -0,0 +1,145 @@
+import json
+import numpy as np
+import pandas as pd
+
+# A binary data set file consists of
+#   - the magic bytes MAGIC,
+#   - the length of the header in bytes as 8 byte little endian integer,
+#   - the header as UTF-8 encoded JSON,
+#   - zero bytes up to the next multiple of ALIGNMENT,
+#   - the codes of all columns one after another, every column as an array of integers of the data type in the header.
+# The header holds the amount of rows, the column names, the value dictionary of every column (the value of code i is
+# the i-th entry), the data type of the codes, the numeric columns, and the seed and rules the data was created with.
+MAGIC = b"DETTADS1"
+ALIGNMENT = 64
+FILE_ENDING = ".detta"
+
+
+class Dataset:
+    def __init__(self, path: str, header: dict, codes: np.ndarray):
+        """
+        A binary data set. The codes are memory-mapped from the file and not read into memory.
+        :param path: The path of the file.
+        :param header: The header of the file.
+        :param codes: The codes with a row for every column and a column for every row of the data set.
+        """
+        self.path = path
+        self.rows: int = header["rows"]
+        self.columns: list[str] = header["columns"]
+        self.dictionaries: list[list[str]] = header["dictionaries"]
+        self.seed: int | None = header["seed"]
+        self.rules: list[dict[str, str]] | None = header["rules"]
+        self.numeric_columns: list[str] = header.get("numeric_columns", [])  # the columns whose values are numbers
+        self.codes = codes
+
+
+def save_rows(path: str, rows: [[]], seed: int | None = None, rules: list[dict[str, str]] | None = None,
+              numeric_columns: list[str] | None = None) -> None:
+    """
+    Save the rows of the generator in a binary data set file.
+    :param path: The path of the file.
+    :param rows: The rows of the data set. The first row holds the column names.
+    :param seed: The seed the data was created with.
+    :param rules: The rules the data was classified with.
+    :param numeric_columns: The columns whose values are numbers, which the solver splits at thresholds.
+    """
+    values = np.array(rows[1:], dtype=object).reshape(len(rows) - 1, len(rows[0]))
+    dictionaries = []
+    codes = []
+    for i in range(len(rows[0])):
+        col_codes, uniques = pd.factorize(values[:, i])
+        codes.append(col_codes)
+        dictionaries.append([str(val) for val in uniques])
+    write_dataset(path, rows[0], dictionaries, codes, seed, rules, numeric_columns)
+
+
+def write_dataset(path: str, columns: list[str], dictionaries: list[list[str]], codes: list[np.ndarray],
+                  seed: int | None = None, rules: list[dict[str, str]] | None = None,
+                  numeric_columns: list[str] | None = None) -> None:
+    """
+    Write a binary data set file.
+    :param path: The path of the file.
+    :param columns: The column names.
+    :param dictionaries: The value dictionary of every column.
+    :param codes: The codes of every column.
+    :param seed: The seed the data was created with.
+    :param rules: The rules the data was classified with.
+    :param numeric_columns: The columns whose values are numbers, which the solver splits at thresholds.
+    """
+    # the smallest data type which pandas can use for categorical codes without copying them
+    max_values = max([len(dictionary) for dictionary in dictionaries], default=0)
+    if max_values <= np.iinfo(np.int8).max:
+        dtype = np.int8
+    elif max_values <= np.iinfo(np.int16).max:
+        dtype = np.int16
+    else:
+        dtype = np.int32
+
+    rows = len(codes[0]) if len(codes) > 0 else 0
+    header = json.dumps({"rows": rows, "columns": list(columns), "dictionaries": dictionaries,
+                         "dtype": np.dtype(dtype).name, "seed": seed, "rules": rules,
+                         "numeric_columns": list(numeric_columns or [])}).encode("utf-8")
+    offset = data_offset(len(header))
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(bytes(offset - len(MAGIC) - 8 - len(header)))
+        for col_codes in codes:
+            f.write(np.asarray(col_codes, dtype=dtype).tobytes())
+
+
+def read_dataset(path: str) -> Dataset:
+    """
+    Read a binary data set file. The codes are memory-mapped.
+    :param path: The path of the file.
+    :return: The data set.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(path + " is not a binary data set file")
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    if header["rows"] == 0 or len(header["columns"]) == 0:
+        codes = np.empty((len(header["columns"]), 0), dtype=header["dtype"])
+    else:
+        codes = np.memmap(path, dtype=header["dtype"], mode="r", offset=data_offset(header_length),
+                          shape=(len(header["columns"]), header["rows"]))
+    return Dataset(path, header, codes)
+
+
+def to_data_frame(dataset: Dataset) -> pd.DataFrame:
+    """
+    Create a data frame with a categorical column for every column of the data set. The categorical columns use the
+    memory-mapped codes without copying them.
+    :param dataset: The data set.
+    :return: The data frame.
+    """
+    data = {}
+    for i in range(len(dataset.columns)):
+        data[dataset.columns[i]] = pd.Categorical.from_codes(dataset.codes[i], categories=dataset.dictionaries[i])
+    return pd.DataFrame(data, copy=False)
+
+
+def export_csv(dataset: Dataset, csv_path: str, chunk_size: int = 1000000) -> None:
+    """
+    Export a data set as a CSV file in the format of generator.save_file.
+    :param dataset: The data set.
+    :param csv_path: The path of the CSV file.
+    :param chunk_size: The amount of rows which are decoded at once.
+    """
+    dictionaries = [np.array(dictionary, dtype=object) for dictionary in dataset.dictionaries]
+    with open(csv_path, "w") as f:
+        f.write(";".join(dataset.columns) + "\n")
+        for start in range(0, dataset.rows, chunk_size):
+            chunk = {dataset.columns[i]: dictionaries[i][dataset.codes[i, start:start + chunk_size]]
+                     for i in range(len(dataset.columns))}
+            pd.DataFrame(chunk).to_csv(f, sep=";", header=False, index=False, lineterminator="\n")
+
+
+def data_offset(header_length: int) -> int:
+    """
+    :param header_length: The length of the header in bytes.
+    :return: The position of the first code in the file.
+    """
+    return -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
@@ -1,10 +1,17 @@
+import typing
 from datetime import datetime
 from itertools import chain
 from os import path
 from numpy import random as r
+import dataset as d
 
+# the values of numeric columns are integers from 0 to NUMERIC_MAX - 1
+NUMERIC_MAX = 100
 
-def create_data(columns: int, values: int, rows: int, data_path: str) -> str:
+
+def create_data(columns: int, values: int, rows: int, data_path: str, seed: int | None = None, binary: bool = False,
+                numeric_columns: int = 0, progress: typing.Callable[[str], None] | None = None,
+                output: typing.Callable[[str], None] | None = None) -> str:
     """
     This method gets called from the GUI, receives all user input, and starts to create synthetic data.
     Nothing happens when invalid arguments are given.
@@ -12,23 +19,64 @@ def create_data(columns: int, values: int, rows: int, data_path: str) -> str:
     :param values: Amount of different values in each column
     :param rows: Amount of rows/lines to be randomly created
     :param data_path: Output path, where the file is to be stored
-    :return: The path to the csv file
+    :param seed: Optional seed for the random generator. The same seed and parameters create the same data.
+    :param binary: Flag on whether the data is to be saved as a binary data set file (see dataset.py) instead of a CSV
+    file. Binary data set files also store which columns are numeric.
+    :param numeric_columns: Amount of numeric columns to be created in addition to the other columns
+    :param progress: Optional callback which receives a message whenever a new step starts.
+    :param output: Optional callback which receives the path of the file before it is written.
+    :return: The path to the csv file or binary data set file
     """
 
-    file_path = create_file(data_path)
-    cols = create_columns(columns)
-    vals_columns = create_column_values(cols, values)
-    rules = create_rules(cols, vals_columns)
-    created_rows = create_rows(rows, cols, vals_columns)
-    classified_rows = classify_rows(created_rows, rules)
-    save_file(file_path, classified_rows)
+    if seed is not None:
+        r.seed(seed)
+    if progress is not None:
+        progress("Creating rows")
+    classified_rows, rules = create_classified_rows(columns, values, rows, numeric_columns)
+    if progress is not None:
+        progress("Saving file")
+    if binary:  # the file is only created when the rows are ready
+        file_path = create_file(data_path, seed, d.FILE_ENDING)
+    else:
+        file_path = create_file(data_path, seed)
+    if output is not None:
+        output(file_path)
+    if binary:
+        d.save_rows(file_path, classified_rows, seed, rules, classified_rows[0][columns:-1])
+    else:
+        save_file(file_path, classified_rows)
     return file_path
 
 
-def create_file(data_path: str) -> str:
+def create_classified_rows(columns: int, values: int, rows: int,
+                           numeric_columns: int = 0) -> ([[]], [{str: str}]):
+    """
+    Creates the classified rows of a data set in memory without writing any file.
+    :param columns: Amount of columns to be created
+    :param values: Amount of different values in each column
+    :param rows: Amount of rows/lines to be randomly created
+    :param numeric_columns: Amount of numeric columns to be created after the other columns. The rules compare them
+    with values - 1 thresholds.
+    :return: A tuple. The first element are the rows: the first row holds the column names, every other row is a list
+    of attribute values including the target attribute value. The second element are the rules the rows were classified
+    with.
+    """
+    cols = create_columns(columns + numeric_columns)
+    numeric_cols = cols[columns:]
+    vals_columns = create_column_values(cols[:columns], values)
+    conditions_columns = create_numeric_conditions(numeric_cols, values)
+    rules = create_rules(cols, {**vals_columns, **conditions_columns})
+    created_rows = create_rows(rows, cols, vals_columns, numeric_cols)
+    return classify_rows(created_rows, rules), rules
+
+
+def create_file(data_path: str, seed: int | None = None, file_ending: str = ".csv") -> str:
     """
-    Creates an empty CSV file.
+    Creates an empty CSV file. When a file with the same name exists, e.g. because another data set was created in
+    the same second, a number is added to the file name.
     :param data_path: The path to the CSV file.
+    :param seed: The seed the data is created with. It is added to the file name when given.
+    :param file_ending: The file ending, ".csv" for CSV files.
     :return: The path to the CSV file.
     """
     # Create file name from current timestamp
@@ -41,14 +89,21 @@ def create_file(data_path: str) -> str:
     s: str = str(d1.second)
 
     # File name
-    file_name: str = "Data_" + y + "." + mo + "." + d + "-" + h + "." + mi + "." + s + ".csv"
-
-    # Create file
-    fn: str = path.join(data_path, file_name)  # Create file handler
-    output_file = open(fn, "w")
-    output_file.close()
+    file_name: str = "Data_" + y + "." + mo + "." + d + "-" + h + "." + mi + "." + s
+    if seed is not None:
+        file_name += "_seed" + str(seed)
 
-    return fn
+    # Create file, the exclusive mode fails instead of overwriting an existing file
+    number = 1
+    while True:
+        fn: str = path.join(data_path, file_name + ("_" + str(number) if number > 1 else "") + file_ending)
+        try:
+            output_file = open(fn, "x")
+        except FileExistsError:
+            number += 1
+            continue
+        output_file.close()
+        return fn
 
 
 def create_columns(amount_of_cols: int) -> list[str]:
@@ -81,13 +136,31 @@ def create_column_values(cols: list[str], values_per_column: int) -> {str: [str]
     return vals
 
 
+def create_numeric_conditions(cols: list[str], values_per_column: int) -> {str: [str]}:
+    """
+    Creates the conditions the rules can use for each numeric column. The thresholds split the range of the values
+    into values_per_column equally wide parts.
+    :param cols: The numeric columns.
+    :param values_per_column: The amount of parts.
+    :return: A dictionary where the key is the column and the value is the list of conditions, e.g. "<= 50" and "> 50".
+    """
+    conditions: {str: [str]} = {}
+    for col in cols:
+        conditions_for_col: [str] = []
+        for i in range(1, max(values_per_column, 2)):
+            threshold = round(i * NUMERIC_MAX / max(values_per_column, 2))
+            conditions_for_col += ["<= " + str(threshold), "> " + str(threshold)]
+        conditions.update({col: conditions_for_col})
+    return conditions
+
+
 def create_rules(cols: [str], cols_vals: {str:  [str]}) -> [{str: str}]:
     """
     Creates the rules based on which the data will be classified.
     :param cols: The columns of the data set.
-    :param cols_vals: The values for each column.
-    :return: The rules. Every rule is a dictionary of attribute (key) and the value the attribute has to have
-    (value).
+    :param cols_vals: The values for each column, the conditions for numeric columns.
+    :return: The rules. Every rule is a dictionary of attribute (key) and the value the attribute has to have or the
+    condition it has to meet (value).
     """
     values_per_col = len(cols_vals[cols[0]])
 
@@ -95,6 +168,7 @@ def create_rules(cols: [str], cols_vals: {str:  [str]}) -> [{str: str}]:
     amount_of_rules: int = int((len(cols) * values_per_col) / 2)
     mean = len(cols) / 2
     std = mean / 2
+    max_discarded_rules = 1000
 
     # amount of rules for every rule length
     rule_lengths = []
@@ -114,7 +188,8 @@ def create_rules(cols: [str], cols_vals: {str:  [str]}) -> [{str: str}]:
         rules.append([])
         for j in range(rule_lengths[i]):
             curr_rule = {}
-            while len(curr_rule) < i:
+            discarded_rules = 0  # stops the search when there are no unique rules of this length left
+            while len(curr_rule) < i and discarded_rules < max_discarded_rules:
                 random_col = cols[r.randint(0, len(cols))]
                 while random_col in curr_rule:
                     random_col = cols[r.randint(0, len(cols))]
@@ -127,26 +202,32 @@ def create_rules(cols: [str], cols_vals: {str:  [str]}) -> [{str: str}]:
                         if rule.items() <= curr_rule_items:
                             curr_rule = {}
                             unique_rule = False
+                            discarded_rules += 1
                             break
                     if not unique_rule:
                         break
-            rules[i].append(curr_rule)
+            if len(curr_rule) == i:
+                rules[i].append(curr_rule)
     return list(chain.from_iterable(rules))
 
 
-def create_rows(number_of_rows: int, cols: [str], cols_vals: {str: [str]}) -> [[]]:
+def create_rows(number_of_rows: int, cols: [str], cols_vals: {str: [str]}, numeric_cols: [str] = ()) -> [[]]:
     """
     Create the rows for the data set without the target attribute.
     :param number_of_rows: The number of rows of the data set.
     :param cols: The columns of the data set.
-    :param cols_vals: The values for the cols.
+    :param cols_vals: The values for the cols which are not numeric.
+    :param numeric_cols: The numeric columns. Their values are random integers from 0 to NUMERIC_MAX - 1.
     :return: The rows. Every row is a list of attribute values without the target attribute value.
     """
     rows = [cols]
     for i in range(number_of_rows):
         row = []
         for col in cols:
-            val = r.choice(cols_vals[col])
+            if col in numeric_cols:
+                val = str(r.randint(0, NUMERIC_MAX))
+            else:
+                val = r.choice(cols_vals[col])
             row.append(val)
         rows.append(row)
     return rows
@@ -159,10 +240,11 @@ def classify_rows(rows: [[]], rules: [{str: str}]) -> [[]]:
     :param rules: The rules based on which the rows are to be classified.
     :return: The rows. Every row is a list of attribute values including the target attribute value.
     """
+    col_indices = {rows[0][i]: i for i in range(len(rows[0]))}
     rows[0].append("classification")
     for i in range(1, len(rows)):
         for rule in rules:
-            if set(rule.values()) <= set(rows[i]):
+            if all(meets_condition(rows[i][col_indices[col]], condition) for col, condition in rule.items()):
                 rows[i].append("Yes")
                 break
         if len(rows[i]) == (len(rows[0]) - 1):
@@ -170,6 +252,21 @@ def classify_rows(rows: [[]], rules: [{str: str}]) -> [[]]:
     return rows
 
 
+def meets_condition(val: str, condition: str) -> bool:
+    """
+    Checks whether an attribute value meets the condition of a rule.
+    :param val: The attribute value.
+    :param condition: The value the attribute has to have, or a threshold condition like "<= 50" or "> 50" for numeric
+    columns.
+    :return: True when the value meets the condition.
+    """
+    if condition.startswith("<= "):
+        return float(val) <= float(condition[3:])
+    if condition.startswith("> "):
+        return float(val) > float(condition[2:])
+    return val == condition
+
+
 def save_file(fn: str, rows: [[]]) -> None:
     """
     Save the rows in a file.
@@ -177,8 +274,17 @@ def save_file(fn: str, rows: [[]]) -> None:
     :param rows: The rows of the data set.
     """
     output_file = open(fn, "w")
-    for row in rows:
-        for i in range(len(row)-1):
-            output_file.write(row[i] + ";")
-        output_file.write(row[len(row)-1] + "\n")
+    output_file.write(csv_text(rows))
     output_file.close()
+
+
+def csv_text(rows: [[]]) -> str:
+    """
+    Create the content of the CSV file for the rows.
+    :param rows: The rows of the data set.
+    :return: The content of the CSV file.
+    """
+    lines = []
+    for row in rows:
+        lines.append(";".join(row) + "\n")
+    return "".join(lines)
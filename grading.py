@@ -0,0 +1,157 @@
+import csv
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import tree as t
+
+# the file endings of submissions which are graded
+SUBMISSION_FILE_ENDINGS = (".dot", ".gv", ".json")
+
+
+def read_tree(path: str) -> t.Tree:
+    """
+    Read a tree from a DOT or JSON file.
+    :param path: The path of the file.
+    :return: The tree.
+    """
+    with open(path) as f:
+        text = f.read()
+    if path.endswith(".json"):
+        return t.from_json(text)
+    return t.from_dot(text)
+
+
+def subtree_hashes(tree: t.Tree) -> list[str]:
+    """
+    Calculates a canonical hash for the subtree of every node. The hash only depends on the labels of the nodes and
+    edges (see normalize), not on the order of the edges or on the node ids, so equal subtrees have equal hashes.
+    :param tree: The tree.
+    :return: The hash of every node.
+    """
+    hashes = [""] * len(tree)
+    for node in reversed(range(len(tree))):  # children always have larger ids than their parents
+        children = sorted((normalize(tree.edge_values[child]), hashes[child]) for child in tree.children[node])
+        text = repr((normalize(tree.labels[node]), children))
+        hashes[node] = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return hashes
+
+
+def normalize(label: str | None) -> str:
+    """
+    Normalizes a node or edge label for comparisons. Surrounding white space is ignored, e.g. the ids which older
+    versions of this program used as labels of the root node end with a blank.
+    :param label: The label.
+    :return: The normalized label.
+    """
+    return str(label).strip() if label is not None else ""
+
+
+def compare_trees(reference: t.Tree, submission: t.Tree) -> (int, list[dict[str, str]]):
+    """
+    Compares a submitted tree structurally with the reference tree. Subtrees with equal hashes are skipped at once, the
+    others are compared node by node. Child nodes are matched by the labels of their edges, every submitted subtree
+    which is not matched is reported.
+    :param reference: The reference tree.
+    :param submission: The submitted tree.
+    :return: A tuple. The first element is the amount of reference nodes which are found in the submission at the same
+            position with the same label. The second element is the list of mismatches. Every mismatch has a "path"
+            from the root (edge labels separated by " > "), a "kind" (label, missing edge, extra edge or duplicate
+            edge, i.e. a further submitted edge with the label of a reference edge), and the "expected" and "found"
+            labels.
+    """
+    reference_hashes = subtree_hashes(reference)
+    submission_hashes = subtree_hashes(submission)
+    subtree_sizes = [1] * len(reference)
+    for node in reversed(range(1, len(reference))):
+        subtree_sizes[reference.parents[node]] += subtree_sizes[node]
+
+    correct = 0
+    mismatches = []
+    stack = [(0, 0, "root")]  # (reference node, submitted node, path)
+    while len(stack) > 0:
+        node, submitted_node, path = stack.pop()
+        if reference_hashes[node] == submission_hashes[submitted_node]:
+            correct += subtree_sizes[node]
+            continue
+        if normalize(reference.labels[node]) != normalize(submission.labels[submitted_node]):
+            mismatches.append({"path": path, "kind": "label", "expected": reference.labels[node],
+                               "found": submission.labels[submitted_node]})
+            continue
+        correct += 1
+
+        submitted_children: dict[str, list[int]] = {}  # edge label -> submitted children with this edge label
+        for child in submission.children[submitted_node]:
+            submitted_children.setdefault(normalize(submission.edge_values[child]), []).append(child)
+        for child in reference.children[node]:
+            edge_value = normalize(reference.edge_values[child])
+            child_path = path + " > " + str(edge_value)
+            if edge_value in submitted_children:
+                stack.append((child, submitted_children[edge_value].pop(0), child_path))
+                for duplicate in submitted_children.pop(edge_value):  # further edges with the same label
+                    mismatches.append({"path": child_path, "kind": "duplicate edge", "expected": "",
+                                       "found": submission.labels[duplicate]})
+            else:
+                mismatches.append({"path": child_path, "kind": "missing edge", "expected": reference.labels[child],
+                                   "found": ""})
+        for edge_value, children in submitted_children.items():
+            for child in children:
+                mismatches.append({"path": path + " > " + str(edge_value), "kind": "extra edge", "expected": "",
+                                   "found": submission.labels[child]})
+    mismatches.sort(key=lambda mismatch: mismatch["path"])
+    return correct, mismatches
+
+
+def grade_file(reference: t.Tree, path: str) -> dict:
+    """
+    Grades a submitted tree.
+    :param reference: The reference tree.
+    :param path: The path of the DOT or JSON file of the submission.
+    :return: The result with the file name, the score, the amount of correct and reference nodes, the mismatches and
+            an error message when the submission cannot be read. The score is the amount of correct nodes divided by
+            the amount of nodes of the larger tree, so that extra nodes lower the score, too.
+    """
+    result = {"file": os.path.basename(path), "score": 0.0, "correct": 0, "nodes": len(reference), "mismatches": [],
+              "error": ""}
+    try:
+        submission = read_tree(path)
+    except Exception as e:  # one unreadable submission must not stop the grading of the others
+        result["error"] = repr(e)
+        return result
+    if len(submission) == 0:
+        result["error"] = "empty tree"
+        return result
+    correct, mismatches = compare_trees(reference, submission)
+    result["score"] = correct / max(len(reference), len(submission))
+    result["correct"] = correct
+    result["mismatches"] = mismatches
+    return result
+
+
+def grade_folder(reference: t.Tree, folder: str, report_path: str | None = None,
+                 workers: int | None = None) -> list[dict]:
+    """
+    Grades all DOT and JSON files of a folder in parallel and writes a report.
+    :param reference: The reference tree, e.g. the return value of solver.process_data or read with read_tree.
+    :param folder: The folder with the submissions.
+    :param report_path: The path of the CSV report. It is saved as grading_report.csv in the folder when None.
+    :param workers: The amount of worker processes. All CPUs are used when None.
+    :return: The results of all submissions, see grade_file.
+    """
+    paths = sorted(os.path.join(folder, file_name) for file_name in os.listdir(folder)
+                   if file_name.endswith(SUBMISSION_FILE_ENDINGS))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(partial(grade_file, reference), paths,
+                                    chunksize=max(1, len(paths) // 64)))
+
+    if report_path is None:
+        report_path = os.path.join(folder, "grading_report.csv")
+    with open(report_path, "w", newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(["file", "score", "correct", "nodes", "mismatches", "error"])
+        for result in results:
+            details = [mismatch["path"] + ": " + mismatch["kind"] + " (expected " + str(mismatch["expected"]) +
+                       ", found " + str(mismatch["found"]) + ")" for mismatch in result["mismatches"]]
+            writer.writerow([result["file"], round(result["score"], 3), result["correct"], result["nodes"],
+                             " | ".join(details), result["error"]])
+    return results
@@ -4,6 +4,7 @@ from tkinter import Button, Entry, END, ttk, Label
 import tkinter as tk
 import typing
 import generator as g
+import jobs
 import solver as s
 
 
@@ -18,21 +19,38 @@ class GUI:
         self.lbl_file_in_val = None
         self.lbl_path_out = None
         self.lbl_path_out_val = None
+        self.ent_numeric_cols_val: tk.StringVar | None = None
         self.lbl_path_data_out = None
         self.Columns: Entry | None = None
         self.Rows: Entry | None = None
         self.Values: Entry | None = None
+        self.lst_jobs: tk.Listbox | None = None
+        self.listed_jobs: list[jobs.Job] = []  # the jobs in the order of the rows of lst_jobs
+        self.scrolled_to_job: jobs.Job | None = None  # the running job which lst_jobs was last scrolled to
+        self.progress_bar: ttk.Progressbar | None = None
+        self.progress_bar_running = False
+        self.lbl_status_val: tk.StringVar | None = None
+
+        # Background jobs, so that the GUI stays responsive while data is created or processed
+        self.jobs = jobs.JobQueue()
 
         # Create tab control element
         self.tab_control = ttk.Notebook(self.root)
         self.input_tab = self.create_input_tab(self.tab_control)
         self.process_tab = self.create_process_tab(self.tab_control)
+        self.jobs_tab = self.create_jobs_tab(self.tab_control)
         self.tab_control.grid()
 
+        # Status line below the tabs
+        self.lbl_status_val = tk.StringVar(value="No jobs")
+        lbl_status = Label(self.root, textvariable=self.lbl_status_val, anchor=tk.W)
+        lbl_status.grid(sticky=tk.W, padx=5, pady=5)
+
         # Filehandler for data generation
         self.output_file: typing.TextIO | None = None
 
         # Start the GUI
+        self.root.after(100, self.poll_jobs)
         self.root.mainloop()
 
     def create_input_tab(self, tab_control: ttk.Notebook) -> tk.Frame:
@@ -69,17 +87,29 @@ class GUI:
         ent_rows.grid(column=1, row=2, sticky=tk.W, padx=5, pady=5)
         self.Columns = ent_rows
 
+        # amount of numeric columns
+        lbl_numeric_cols = Label(tab, text="Amount of numeric columns:")
+        lbl_numeric_cols.grid(column=0, row=3, sticky=tk.W, padx=5, pady=5)
+        ent_numeric_cols_val = tk.IntVar()
+        ent_numeric_cols = Entry(tab, width=50, textvariable=ent_numeric_cols_val)
+        ent_numeric_cols.grid(column=1, row=3, sticky=tk.W, padx=5, pady=5)
+
         # data output directory
         btn_output_data = Button(tab, text="Choose data output directory", command=self.choose_data_output_directory)
-        btn_output_data.grid(column=0, row=3, sticky=tk.W, padx=5, pady=5)
+        btn_output_data.grid(column=0, row=4, sticky=tk.W, padx=5, pady=5)
         lbl_path_data_out_val = tk.StringVar()
         lbl_path_data_out = Entry(tab, width=50, state='disabled', textvariable=lbl_path_data_out_val)
-        lbl_path_data_out.grid(column=1, row=3, sticky=tk.W, padx=5, pady=5)
+        lbl_path_data_out.grid(column=1, row=4, sticky=tk.W, padx=5, pady=5)
         self.lbl_path_data_out = lbl_path_data_out
 
         # blank line
         l1 = tk.Label(tab, width=0, height=1)
-        l1.grid(column=0, row=4)
+        l1.grid(column=0, row=5)
+
+        # Checkbox binary data set file
+        c_binary_val = tk.BooleanVar()
+        c_binary = tk.Checkbutton(tab, text="Save as binary data set", variable=c_binary_val)
+        c_binary.grid(column=0, row=6, sticky=tk.W, padx=5, pady=5)
 
         def create_data_action() -> tk.Frame | None:
             """
@@ -88,22 +118,34 @@ class GUI:
             """
 
             # nothing happens with invalid input
-            if ent_cols_val.get() <= 0 or ent_vals_val.get() <= 0 or ent_rows_val.get() <= 0 or \
-                    lbl_path_data_out_val.get() == "":
+            if ent_cols_val.get() < 0 or ent_numeric_cols_val.get() < 0 or \
+                    ent_cols_val.get() + ent_numeric_cols_val.get() <= 0 or ent_vals_val.get() <= 0 or \
+                    ent_rows_val.get() <= 0 or lbl_path_data_out_val.get() == "":
                 return
 
-            # create data
-            data_path = g.create_data(ent_cols_val.get(), ent_vals_val.get(), ent_rows_val.get(),
-                                      lbl_path_data_out_val.get())
-
-            # go to process data tab and set the input file and output directory
-            self.tab_control.select(self.process_tab)
-            self.lbl_file_in_val.set(data_path)
-            self.lbl_path_out_val.set(lbl_path_data_out_val.get())
+            def data_created(data_path: str) -> None:
+                """
+                What happens after the data has been created in the background.
+                :param data_path: The path to the created CSV file.
+                """
+                # go to process data tab and set the input file and output directory
+                self.tab_control.select(self.process_tab)
+                self.lbl_file_in_val.set(data_path)
+                self.lbl_path_out_val.set(output_dir)
+                self.ent_numeric_cols_val.set(", ".join(numeric_columns))
+
+            # create data in the background
+            output_dir = lbl_path_data_out_val.get()
+            numeric_columns = g.create_columns(ent_cols_val.get() + ent_numeric_cols_val.get())[ent_cols_val.get():]
+            self.jobs.submit("Create data", g.create_data, (ent_cols_val.get(), ent_vals_val.get(),
+                                                            ent_rows_val.get(), output_dir, None,
+                                                            c_binary_val.get(), ent_numeric_cols_val.get()),
+                               data_created)
+            self.update_jobs()
 
         # create data button
         btn_create_data = Button(tab, text="Create data...", command=create_data_action)
-        btn_create_data.grid(column=1, row=5, sticky=tk.W, padx=5, pady=5)
+        btn_create_data.grid(column=1, row=6, sticky=tk.W, padx=5, pady=5)
 
         # Add the frame to the frame tab controller
         tab_control.add(tab, text="Input Data")
@@ -129,9 +171,13 @@ class GUI:
         self.lbl_file_in_val = lbl_file_in_val
         self.lbl_file_in = lbl_file_in
 
-        # Blank line
-        l0 = tk.Label(tab, width=0, height=1)
-        l0.grid(column=0, row=1)
+        # Numeric columns
+        lbl_numeric_cols = Label(tab, text="Numeric columns (comma separated):")
+        lbl_numeric_cols.grid(column=0, row=1, sticky=tk.W, padx=5, pady=5)
+        ent_numeric_cols_val = tk.StringVar()
+        ent_numeric_cols = Entry(tab, width=50, textvariable=ent_numeric_cols_val)
+        ent_numeric_cols.grid(column=1, row=1, sticky=tk.W, padx=5, pady=5)
+        self.ent_numeric_cols_val = ent_numeric_cols_val
 
         # Output directory
         btn_output = Button(tab, text="Choose output directory...", command=self.choose_output_directory)
@@ -183,12 +229,29 @@ class GUI:
         c5 = tk.Checkbutton(tab, text="Create DOT file", variable=c5_val)
         c5.grid(column=0, row=7, sticky=tk.W, padx=5, pady=5)
 
+        # Checkbox JSON file
+        c6_val = tk.BooleanVar()
+        c6 = tk.Checkbutton(tab, text="Create JSON file", variable=c6_val)
+        c6.grid(column=1, row=7, sticky=tk.W, padx=5, pady=5)
+
+        def process_data_action() -> None:
+            """
+            What happens after the "process data" button is pressed. The data is processed in the background.
+            """
+            # nothing happens with invalid input
+            if lbl_file_in_val.get() == "" or lbl_path_out_val.get() == "":
+                return
+
+            # without numeric columns the columns stored in a binary data set file are used
+            numeric_columns = [col.strip() for col in ent_numeric_cols_val.get().split(",") if col.strip() != ""]
+            self.jobs.submit("Process " + os.path.basename(lbl_file_in_val.get()), s.process_data,
+                             (lbl_file_in_val.get(), c2_val.get(), lbl_path_out_val.get(), c3_val.get(), c4_val.get(),
+                              c5_val.get(), c1_val.get(), c6_val.get(),
+                              numeric_columns if len(numeric_columns) > 0 else None))
+            self.update_jobs()
+
         # Button Process Data
-        btn_ok = Button(tab, text="Process Data", width=20, command=lambda: s.process_data(lbl_file_in_val.get(),
-                                                                                           c2_val.get(),
-                                                                                           lbl_path_out_val.get(),
-                                                                                           c3_val.get(), c4_val.get(),
-                                                                                           c5_val.get(), c1_val.get()))
+        btn_ok = Button(tab, text="Process Data", width=20, command=process_data_action)
         btn_ok.grid(column=1, row=8, sticky=tk.W, padx=5, pady=5)
 
         # Button Close
@@ -201,6 +264,108 @@ class GUI:
         tab_control.add(tab, text="Process Data")
         return tab
 
+    def create_jobs_tab(self, tab_control: ttk.Notebook) -> tk.Frame:
+        """
+        Creates the jobs tab, which lists all background jobs.
+        :param tab_control: The main menu of the program.
+        :return: The created frame.
+        """
+        # Create the frame
+        tab = ttk.Frame(tab_control)
+        tab.columnconfigure(0, weight=1)
+        tab.columnconfigure(1, weight=1)
+
+        # List of all jobs
+        lst_jobs = tk.Listbox(tab, width=80, height=10)
+        lst_jobs.grid(column=0, row=0, columnspan=2, sticky=tk.W + tk.E, padx=5, pady=5)
+        self.lst_jobs = lst_jobs
+
+        # Progress bar, which moves while a job is running
+        progress_bar = ttk.Progressbar(tab, mode='indeterminate')
+        progress_bar.grid(column=0, row=1, columnspan=2, sticky=tk.W + tk.E, padx=5, pady=5)
+        self.progress_bar = progress_bar
+
+        def cancel_selected_job() -> None:
+            """
+            Cancels the job which is selected in the list.
+            """
+            for job in [self.listed_jobs[index] for index in lst_jobs.curselection()]:
+                self.jobs.cancel(job)
+            self.update_jobs()
+
+        def cancel_all_jobs() -> None:
+            """
+            Cancels all queued jobs and the running job.
+            """
+            self.jobs.cancel_all()
+            self.update_jobs()
+
+        # Cancel buttons
+        btn_cancel = Button(tab, text="Cancel selected job", width=20, command=cancel_selected_job)
+        btn_cancel.grid(column=0, row=2, sticky=tk.W, padx=5, pady=5)
+        btn_cancel_all = Button(tab, text="Cancel all jobs", width=20, command=cancel_all_jobs)
+        btn_cancel_all.grid(column=1, row=2, sticky=tk.W, padx=5, pady=5)
+
+        # Add the frame to the frame tab controller
+        tab_control.add(tab, text="Jobs")
+        return tab
+
+    def poll_jobs(self) -> None:
+        """
+        Receives the progress of the background jobs and updates the GUI. Reschedules itself on the main loop.
+        """
+        self.jobs.poll()
+        self.update_jobs()
+        self.root.after(100, self.poll_jobs)
+
+    def update_jobs(self) -> None:
+        """
+        Shows the current state of all background jobs in the jobs tab and in the status line.
+        """
+        # job list, only changed rows are replaced so that the scroll position and the selection are kept
+        selected_jobs = [self.listed_jobs[index] for index in self.lst_jobs.curselection()]
+        top = self.lst_jobs.yview()[0]
+        for i in range(len(self.jobs.jobs)):
+            text = self.jobs.jobs[i].describe()
+            if i >= len(self.listed_jobs):
+                self.lst_jobs.insert(END, text)
+            elif self.listed_jobs[i] is not self.jobs.jobs[i] or self.lst_jobs.get(i) != text:
+                self.lst_jobs.delete(i)
+                self.lst_jobs.insert(i, text)
+        self.lst_jobs.delete(len(self.jobs.jobs), END)
+        self.listed_jobs = list(self.jobs.jobs)
+        self.lst_jobs.yview_moveto(top)
+
+        # the selected jobs stay selected when rows were replaced or finished jobs were dropped
+        selection = tuple(i for i in range(len(self.listed_jobs)) if self.listed_jobs[i] in selected_jobs)
+        if self.lst_jobs.curselection() != selection:
+            self.lst_jobs.selection_clear(0, END)
+            for index in selection:
+                self.lst_jobs.selection_set(index)
+
+        # scroll to a job when it starts, afterwards the user can scroll freely
+        if self.jobs.current is not None and self.jobs.current is not self.scrolled_to_job:
+            self.lst_jobs.see(self.listed_jobs.index(self.jobs.current))
+            self.scrolled_to_job = self.jobs.current
+
+        # progress bar
+        if self.jobs.is_busy() and not self.progress_bar_running:
+            self.progress_bar.start(10)
+        elif not self.jobs.is_busy() and self.progress_bar_running:
+            self.progress_bar.stop()
+        self.progress_bar_running = self.jobs.is_busy()
+
+        # status line
+        if self.jobs.current is not None:
+            status = "Running: " + self.jobs.current.describe()
+            if len(self.jobs.pending) > 0:
+                status += " | " + str(len(self.jobs.pending)) + " queued"
+        elif len(self.jobs.jobs) > 0:
+            status = "Last job: " + self.jobs.jobs[-1].describe()
+        else:
+            status = "No jobs"
+        self.lbl_status_val.set(status)
+
     def choose_input_file(self):
         """
         The command which is executed after the button for choosing the input file is pressed.
@@ -262,4 +427,5 @@ class GUI:
         :param c4_dummy:
         :param c1_dummy:
         """
+        self.jobs.cancel_all()
         self.root.quit()
@@ -0,0 +1,224 @@
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+import os
+import time
+import typing
+from collections import deque
+
+
+class Job:
+    def __init__(self, job_id: int, name: str, function: typing.Callable, args: tuple,
+                 on_done: typing.Callable[[typing.Any], None] | None):
+        """
+        A job which is executed in a background process.
+        :param job_id: The id of the job.
+        :param name: The name which is shown in the GUI.
+        :param function: The function which is executed. It must be defined on module level and accept a progress
+                and an output keyword argument, see run_job.
+        :param args: The arguments of the function.
+        :param on_done: Called with the return value of the function after the job is finished successfully.
+        """
+        self.job_id = job_id
+        self.name = name
+        self.function = function
+        self.args = args
+        self.on_done = on_done
+        self.status = "queued"  # queued, running, done, failed or cancelled
+        self.progress = ""  # the last progress message of the job
+        self.outputs: list[str] = []  # the files and folders which the job creates, removed when it is cancelled
+        self.started: float | None = None
+        self.finished: float | None = None
+
+    def describe(self) -> str:
+        """
+        Describes the job in one line.
+        :return: The description of the job.
+        """
+        text = "#" + str(self.job_id) + " " + self.name + ": " + self.status
+        if self.progress != "" and self.status in ("running", "failed"):
+            text += " (" + self.progress + ")"
+        if self.started is not None:
+            end = self.finished if self.finished is not None else time.time()
+            text += " " + str(round(end - self.started, 1)) + "s"
+        return text
+
+
+class JobQueue:
+    def __init__(self, max_finished_jobs: int = 50):
+        """
+        Executes jobs one after another in a background process so that the GUI stays responsive. The queue does not
+        use any threads, poll() has to be called regularly (e.g. with root.after) to receive progress messages and to
+        start the next job.
+        :param max_finished_jobs: How many finished jobs are kept in jobs. The oldest ones are dropped.
+        """
+        self.max_finished_jobs = max_finished_jobs
+        self.next_job_id = 1
+        self.jobs: list[Job] = []  # the queued, the running and the latest finished jobs in the order of submission
+        self.pending: deque[Job] = deque()  # the jobs which wait to be executed
+        self.current: Job | None = None  # the job which is executed right now
+        self.process: mp.Process | None = None
+        self.connection: Connection | None = None  # receives the messages of the current job
+        self.context = mp.get_context("spawn")  # a fresh process, which does not share the state of the GUI
+
+    def submit(self, name: str, function: typing.Callable, args: tuple,
+               on_done: typing.Callable[[typing.Any], None] | None = None) -> Job:
+        """
+        Adds a job to the end of the queue.
+        :param name: The name which is shown in the GUI.
+        :param function: The function which is executed. It must be defined on module level and accept a progress
+                and an output keyword argument, see run_job.
+        :param args: The arguments of the function.
+        :param on_done: Called in the GUI process with the return value of the function after the job is finished
+                successfully.
+        :return: The created job.
+        """
+        job = Job(self.next_job_id, name, function, args, on_done)
+        self.next_job_id += 1
+        self.jobs.append(job)
+        self.pending.append(job)
+        self.start_next_job()
+        return job
+
+    def cancel(self, job: Job) -> None:
+        """
+        Cancels a job. A queued job is removed from the queue, a running job is terminated and the files it has
+        created so far are removed.
+        :param job: The job to be cancelled.
+        """
+        if job.status == "queued":
+            self.pending.remove(job)
+            job.status = "cancelled"
+            self.drop_finished_jobs()
+        elif job.status == "running":
+            self.process.terminate()
+            self.process.join()
+            try:
+                while self.connection.poll():  # outputs which were sent right before the process was terminated
+                    kind, payload = self.connection.recv()
+                    if kind == "output":
+                        job.outputs.append(payload)
+            except EOFError:
+                pass
+            self.finish_current_job("cancelled")
+            remove_outputs(job.outputs)
+            self.start_next_job()
+
+    def cancel_all(self) -> None:
+        """
+        Cancels all queued jobs and the running job.
+        """
+        for job in list(self.pending):
+            self.cancel(job)
+        if self.current is not None:
+            self.cancel(self.current)
+
+    def is_busy(self) -> bool:
+        """
+        :return: True when a job is running.
+        """
+        return self.current is not None
+
+    def poll(self) -> None:
+        """
+        Receives the messages of the running job and starts the next job when the running job is finished.
+        """
+        if self.current is None:
+            return
+        try:
+            while self.connection.poll():
+                kind, payload = self.connection.recv()
+                if kind == "progress":
+                    self.current.progress = payload
+                elif kind == "output":
+                    self.current.outputs.append(payload)
+                elif kind == "done":
+                    job = self.current
+                    self.process.join()
+                    self.finish_current_job("done")
+                    if job.on_done is not None:
+                        job.on_done(payload)
+                    break
+                else:
+                    self.current.progress = payload
+                    self.process.join()
+                    self.finish_current_job("failed")
+                    break
+        except EOFError:  # the process ended without sending a result
+            self.process.join()
+            self.current.progress = "exit code " + str(self.process.exitcode)
+            self.finish_current_job("failed")
+        self.start_next_job()
+
+    def start_next_job(self) -> None:
+        """
+        Starts the next queued job when no job is running.
+        """
+        if self.current is not None or len(self.pending) == 0:
+            return
+        job = self.pending.popleft()
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=run_job, args=(job.function, job.args, sender), daemon=True)
+        process.start()
+        sender.close()  # only the background process writes, so that recv() notices when it ends
+        job.status = "running"
+        job.started = time.time()
+        self.current = job
+        self.process = process
+        self.connection = receiver
+
+    def finish_current_job(self, status: str) -> None:
+        """
+        Marks the running job as finished.
+        :param status: done, failed or cancelled
+        """
+        self.current.status = status
+        self.current.finished = time.time()
+        self.connection.close()
+        self.current = None
+        self.process = None
+        self.connection = None
+        self.drop_finished_jobs()
+
+    def drop_finished_jobs(self) -> None:
+        """
+        Drops the oldest finished jobs from jobs when there are more than max_finished_jobs.
+        """
+        finished = [job for job in self.jobs if job.status in ("done", "failed", "cancelled")]
+        if len(finished) > self.max_finished_jobs:
+            dropped = set(finished[:len(finished) - self.max_finished_jobs])
+            self.jobs = [job for job in self.jobs if job not in dropped]
+
+
+def remove_outputs(outputs: list[str]) -> None:
+    """
+    Removes the files and the empty folders which a cancelled job has created.
+    :param outputs: The paths in the order in which they were created.
+    """
+    for path in reversed(outputs):  # files before the folders they are in
+        try:
+            if os.path.isdir(path):
+                os.rmdir(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError:  # e.g. a folder which holds other files
+            pass
+
+
+def run_job(function: typing.Callable, args: tuple, connection: Connection) -> None:
+    """
+    Executes a job in the background process and sends the progress messages, the paths of the created files and the
+    result to the GUI process.
+    :param function: The function to be executed. It is called with a progress keyword argument, which receives the
+            progress messages, and an output keyword argument, which receives the path of every file or folder before
+            it is created.
+    :param args: The arguments of the function.
+    :param connection: The connection to the GUI process.
+    """
+    try:
+        result = function(*args, progress=lambda text: connection.send(("progress", text)),
+                          output=lambda path: connection.send(("output", path)))
+        connection.send(("done", result))
+    except Exception as e:
+        connection.send(("failed", repr(e)))
+    finally:
+        connection.close()
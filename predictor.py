@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+import dataset as d
+import tree as t
+
+
+class CompiledTree:
+    def __init__(self, tree: t.Tree):
+        """
+        A decision tree compiled into lookup arrays over integer codes, which classifies many rows at once.
+        Every split attribute gets a value dictionary, which maps its values to the codes 0, 1, 2, ... The code -1
+        stands for values which do not occur in the tree. Rows with such a value stop at the node where the value is
+        missing and get the most frequent target attribute value of that node. For trees without class counts (e.g.
+        from tree.from_dot) the target attribute values are taken from the leaves, and such rows get the value of the
+        first leaf below the node.
+        Numeric split attributes get the sorted thresholds of all their nodes instead. A value is coded by the amount of
+        thresholds which are smaller than the value, so a node with the i-th threshold sends the codes 0 to i to its
+        first child and all other codes to its second child.
+        :param tree: The decision tree.
+        :raises ValueError: When the tree is empty.
+        """
+        if len(tree) == 0:
+            raise ValueError("an empty tree cannot be compiled")
+        self.columns: list[str] = []  # the split attributes in the order of their first occurrence in the tree
+        self.dictionaries: list[dict[str, int]] = []  # the value dictionary for every split attribute
+        self.thresholds: list[np.ndarray | None] = []  # the thresholds of numeric split attributes, None for others
+        self.classes: list[str] = list(tree.class_counts[0].keys())  # all target attribute values
+        if len(self.classes) == 0:  # no class counts, the order of the first occurrence among the leaves is used
+            self.classes = list(dict.fromkeys(tree.labels[node] for node in tree.leaves()))
+        self.depth = tree.depth()
+
+        # value dictionaries
+        for node in range(len(tree)):
+            attribute = tree.attributes[node]
+            if attribute is not None and attribute not in self.columns:
+                self.columns.append(attribute)
+                self.dictionaries.append({})
+                self.thresholds.append(None)
+            if tree.thresholds[node] is not None:
+                feature = self.columns.index(attribute)
+                self.thresholds[feature] = np.union1d(self.thresholds[feature] if self.thresholds[feature] is not None
+                                                      else [], [tree.thresholds[node]])
+            if tree.parents[node] >= 0 and tree.thresholds[tree.parents[node]] is None:
+                dictionary = self.dictionaries[self.columns.index(tree.attributes[tree.parents[node]])]
+                if tree.edge_values[node] not in dictionary:
+                    dictionary[tree.edge_values[node]] = len(dictionary)
+
+        # lookup arrays, the last column of children is used for the code -1
+        max_codes = max([len(self.dictionaries[i]) if self.thresholds[i] is None else len(self.thresholds[i]) + 1
+                         for i in range(len(self.columns))], default=0)
+        self.features = np.full(len(tree), -1, dtype=np.int32)  # the column of the split attribute, -1 for leaves
+        self.children = np.full((len(tree), max_codes + 1), -1, dtype=np.int32)  # the child node for every code
+        self.predictions = np.zeros(len(tree), dtype=np.int32)  # the class which is predicted when a row stops here
+        for node in range(len(tree)):
+            if tree.is_leaf(node):
+                self.predictions[node] = self.classes.index(tree.labels[node])
+            else:
+                feature = self.columns.index(tree.attributes[node])
+                self.features[node] = feature
+                counts = tree.class_counts[node]
+                if len(counts) > 0:
+                    self.predictions[node] = self.classes.index(max(counts, key=counts.get))
+                else:
+                    first_leaf = node
+                    while not tree.is_leaf(first_leaf):
+                        first_leaf = tree.children[first_leaf][0]
+                    self.predictions[node] = self.classes.index(tree.labels[first_leaf])
+                if tree.thresholds[node] is not None:
+                    codes = len(self.thresholds[feature]) + 1
+                    split = int(np.searchsorted(self.thresholds[feature], tree.thresholds[node])) + 1
+                    self.children[node, :split] = tree.children[node][0]
+                    self.children[node, split:codes] = tree.children[node][1]
+                    continue
+                for child in tree.children[node]:
+                    self.children[node, self.dictionaries[feature][tree.edge_values[child]]] = child
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Replaces the values of the split attributes by their codes.
+        :param df: The data. It must contain a column for every split attribute, other columns are ignored.
+        :return: A matrix with a row for every row of the data and a column for every split attribute.
+        """
+        codes = np.empty((len(df.index), len(self.columns)), dtype=np.int32)
+        for i in range(len(self.columns)):
+            codes[:, i] = self.encode_values(i, df[self.columns[i]])
+        return codes
+
+    def encode_values(self, feature: int, values) -> np.ndarray:
+        """
+        Replaces the values of one split attribute by their codes.
+        :param feature: The index of the split attribute in columns.
+        :param values: The values. Values of numeric split attributes may also be given as strings.
+        :return: The codes, -1 for unknown values.
+        """
+        if self.thresholds[feature] is None:
+            return pd.Categorical(values, categories=list(self.dictionaries[feature])).codes
+        values = pd.Series(values)
+        if isinstance(values.dtype, pd.CategoricalDtype):  # encode only the categories
+            return np.append(self.encode_values(feature, values.cat.categories), -1)[values.cat.codes]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors='coerce')
+        numbers = values.to_numpy(dtype=float)
+        codes = np.searchsorted(self.thresholds[feature], numbers, side='left')
+        return np.where(np.isnan(numbers), -1, codes)
+
+    def predict_codes(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Classifies coded rows. All rows move one level down the tree at a time.
+        :param codes: The coded rows, see encode.
+        :return: The index of the predicted target attribute value in classes for every row.
+        """
+        rows = np.arange(len(codes))
+        nodes = np.zeros(len(codes), dtype=np.int32)
+        for level in range(self.depth):
+            features = self.features[nodes]
+            next_nodes = self.children[nodes, codes[rows, np.maximum(features, 0)]]
+            nodes = np.where((features >= 0) & (next_nodes >= 0), next_nodes, nodes)  # leaves and rows with unknown
+            # values stay where they are
+        return self.predictions[nodes]
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Classifies the rows of a data frame.
+        :param df: The data.
+        :return: The predicted target attribute value for every row.
+        """
+        return np.array(self.classes, dtype=object)[self.predict_codes(self.encode(df))]
+
+
+def compile_tree(tree: t.Tree) -> CompiledTree:
+    """
+    Compiles a decision tree into lookup arrays.
+    :param tree: The decision tree.
+    :return: The compiled tree.
+    """
+    return CompiledTree(tree)
+
+
+def evaluate(compiled_tree: CompiledTree, df: pd.DataFrame) -> (float, pd.DataFrame):
+    """
+    Classifies the rows of a data frame and compares the predictions with the column "classification".
+    :param compiled_tree: The compiled tree.
+    :param df: The data including the column "classification".
+    :return: A tuple. The first element is the accuracy and the second element is the confusion matrix with the
+            actual target attribute values as rows and the predicted target attribute values as columns. Rows whose
+            target attribute value does not occur in the tree only count as misclassified.
+    """
+    confusion_matrix = confusion_counts(compiled_tree, df)
+    return accuracy(confusion_matrix, len(df.index)), confusion_data_frame(compiled_tree, confusion_matrix)
+
+
+def evaluate_csv(compiled_tree: CompiledTree, path: str, chunk_size: int = 1000000) -> (float, pd.DataFrame):
+    """
+    Classifies the rows of a CSV file in chunks and compares the predictions with the column "classification".
+    :param compiled_tree: The compiled tree.
+    :param path: The path of the CSV file. The separator is detected like in solver.read_csv_file.
+    :param chunk_size: The amount of rows which are classified at once.
+    :return: A tuple of the accuracy and the confusion matrix, see evaluate.
+    """
+    with open(path) as f:
+        header = f.readline()
+    separator = ","
+    for candidate in (";", ",", "\t"):
+        if header.__contains__(candidate):
+            separator = candidate
+            break
+
+    n = 0
+    confusion_matrix = np.zeros((len(compiled_tree.classes), len(compiled_tree.classes)), dtype=np.int64)
+    for chunk in pd.read_csv(path, sep=separator, dtype=str, chunksize=chunk_size):
+        confusion_matrix += confusion_counts(compiled_tree, chunk)
+        n += len(chunk.index)
+    return accuracy(confusion_matrix, n), confusion_data_frame(compiled_tree, confusion_matrix)
+
+
+def evaluate_dataset(compiled_tree: CompiledTree, dataset: d.Dataset,
+                     chunk_size: int = 1000000) -> (float, pd.DataFrame):
+    """
+    Classifies the rows of a binary data set and compares the predictions with the column "classification". The codes
+    of the data set are translated into the codes of the compiled tree with one lookup table per column, so the values
+    are never decoded.
+    :param compiled_tree: The compiled tree.
+    :param dataset: The binary data set.
+    :param chunk_size: The amount of rows which are classified at once.
+    :return: A tuple of the accuracy and the confusion matrix, see evaluate.
+    """
+    # lookup tables from the codes of the data set to the codes of the compiled tree, the last entry is used for -1
+    lookup_tables = []
+    for i in range(len(compiled_tree.columns)):
+        values = dataset.dictionaries[dataset.columns.index(compiled_tree.columns[i])]
+        lookup_tables.append(np.append(compiled_tree.encode_values(i, values), -1).astype(np.int32))
+    classes = dataset.dictionaries[dataset.columns.index("classification")]
+    class_lookup_table = np.array([compiled_tree.classes.index(val) if val in compiled_tree.classes else -1
+                                   for val in classes] + [-1], dtype=np.int32)
+
+    confusion_matrix = np.zeros((len(compiled_tree.classes), len(compiled_tree.classes)), dtype=np.int64)
+    for start in range(0, dataset.rows, chunk_size):
+        codes = np.empty((min(chunk_size, dataset.rows - start), len(compiled_tree.columns)), dtype=np.int32)
+        for i in range(len(compiled_tree.columns)):
+            col = dataset.codes[dataset.columns.index(compiled_tree.columns[i]), start:start + chunk_size]
+            codes[:, i] = lookup_tables[i][col]
+        actual = class_lookup_table[dataset.codes[dataset.columns.index("classification"), start:start + chunk_size]]
+        confusion_matrix += confusion_counts_codes(compiled_tree, codes, actual)
+    return accuracy(confusion_matrix, dataset.rows), confusion_data_frame(compiled_tree, confusion_matrix)
+
+
+def confusion_counts(compiled_tree: CompiledTree, df: pd.DataFrame) -> np.ndarray:
+    """
+    Counts the actual and predicted target attribute values of the rows.
+    :param compiled_tree: The compiled tree.
+    :param df: The data including the column "classification".
+    :return: The confusion matrix as a square array in the order of the classes of the compiled tree.
+    """
+    actual = pd.Categorical(df["classification"], categories=compiled_tree.classes).codes
+    return confusion_counts_codes(compiled_tree, compiled_tree.encode(df), actual)
+
+
+def confusion_counts_codes(compiled_tree: CompiledTree, codes: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """
+    Counts the actual and predicted target attribute values of coded rows.
+    :param compiled_tree: The compiled tree.
+    :param codes: The coded rows, see CompiledTree.encode.
+    :param actual: The index of the actual target attribute value in the classes of the compiled tree for every row,
+            -1 for unknown target attribute values.
+    :return: The confusion matrix as a square array in the order of the classes of the compiled tree.
+    """
+    k = len(compiled_tree.classes)
+    predicted = compiled_tree.predict_codes(codes)
+    known = actual >= 0
+    return np.bincount(actual[known] * k + predicted[known], minlength=k * k).reshape(k, k)
+
+
+def accuracy(confusion_matrix: np.ndarray, n: int) -> float:
+    """
+    :param confusion_matrix: The confusion matrix.
+    :param n: The amount of rows including the rows with unknown target attribute values.
+    :return: The share of correctly classified rows.
+    """
+    if n == 0:
+        return 0.0
+    return float(np.trace(confusion_matrix)) / n
+
+
+def confusion_data_frame(compiled_tree: CompiledTree, confusion_matrix: np.ndarray) -> pd.DataFrame:
+    """
+    :param compiled_tree: The compiled tree.
+    :param confusion_matrix: The confusion matrix.
+    :return: The confusion matrix with the target attribute values as row and column names.
+    """
+    return pd.DataFrame(confusion_matrix, index=pd.Index(compiled_tree.classes, name="actual"),
+                        columns=pd.Index(compiled_tree.classes, name="predicted"))
@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import pandas as pd
+from numpy import random as r
+import generator as g
+import solver as s
+
+
+def search_data(depth: int, min_leaves: int, max_leaves: int, columns: list[int], values: list[int], rows: list[int],
+                data_path: str, amount: int = 1, seeds_per_setting: int = 100, first_seed: int = 0,
+                workers: int | None = None, detailed_solution: bool = False, svg: bool = True, dot: bool = False,
+                sub_folder: bool = True) -> list[str]:
+    """
+    Searches data sets whose decision tree has the given shape. Candidates are all combinations of the given amounts
+    of columns, values and rows, each tried with several seeds. The candidates are checked in parallel with
+    solver.tree_shape, which only counts and creates no files. Only for accepted candidates the data is created and
+    processed like in the GUI.
+    :param depth: The depth the decision tree must have (the amount of edges on the longest path from the root to a
+            leaf).
+    :param min_leaves: The minimum amount of leaves of the decision tree.
+    :param max_leaves: The maximum amount of leaves of the decision tree.
+    :param columns: The amounts of columns to be tried.
+    :param values: The amounts of different values in each column to be tried.
+    :param rows: The amounts of rows to be tried.
+    :param data_path: Output path, where the files are to be stored.
+    :param amount: The amount of data sets to be created.
+    :param seeds_per_setting: How many seeds are tried for every combination of columns, values and rows.
+    :param first_seed: The seed of the first candidate. Every candidate gets its own seed.
+    :param workers: The amount of worker processes. All CPUs are used when None.
+    :param detailed_solution: Flag on whether a detailed solution file is to be created.
+    :param svg: Flag on whether an SVG file of the decision tree is to be created.
+    :param dot: Flag on whether a DOT file is to be created.
+    :param sub_folder: Flag on whether all output files are to be stored in an output folder in the output directory.
+    :return: The paths to the CSV files of the accepted candidates. The list is shorter than amount when not enough
+            candidates have the given shape.
+    """
+    # every candidate is a tuple of seed, columns, values and rows
+    settings = list(product(columns, values, rows))
+    candidates = [(first_seed + i, *settings[i % len(settings)]) for i in range(seeds_per_setting * len(settings))]
+
+    # check the candidates in parallel and keep the first accepted ones in the order of the candidates
+    accepted = []
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        shapes = executor.map(candidate_shape, candidates, chunksize=max(1, len(candidates) // 256))
+        for candidate, shape in zip(candidates, shapes):
+            if shape[0] == depth and min_leaves <= shape[1] <= max_leaves:
+                accepted.append(candidate)
+                if len(accepted) == amount:
+                    break
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    # create all output files for the accepted candidates
+    data_paths = []
+    for seed, cols, vals, n in accepted:
+        data_path_candidate = g.create_data(cols, vals, n, data_path, seed)
+        s.process_data(data_path_candidate, detailed_solution, data_path, svg, False, dot, sub_folder)
+        data_paths.append(data_path_candidate)
+    return data_paths
+
+
+def candidate_shape(candidate: (int, int, int, int)) -> (int, int):
+    """
+    Creates the data of a candidate in memory and calculates the shape of its decision tree.
+    :param candidate: A tuple of seed, amount of columns, amount of values and amount of rows.
+    :return: A tuple of the depth and the amount of leaves of the decision tree.
+    """
+    seed, cols, vals, n = candidate
+    r.seed(seed)
+    classified_rows = g.create_classified_rows(cols, vals, n)[0]
+    df = pd.DataFrame(classified_rows[1:], columns=classified_rows[0])
+    return s.tree_shape(df)
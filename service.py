@@ -0,0 +1,290 @@
+import asyncio
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+import pandas as pd
+from numpy import random as r
+import generator as g
+import solver as s
+import tree as t
+
+# the parameter profiles of the exercises: name -> (amount of columns, values per column, amount of rows)
+PROFILES = {"small": (3, 3, 30), "medium": (4, 3, 60), "large": (5, 4, 120)}
+
+
+def create_exercise(profile: str, columns: int, values: int, rows: int, seed: int, detailed_solution: bool,
+                    svg: bool) -> bytes:
+    """
+    Creates and solves an exercise in memory. This is executed in the worker processes of the service.
+    :param profile: The name of the parameter profile.
+    :param columns: Amount of columns to be created.
+    :param values: Amount of different values in each column.
+    :param rows: Amount of rows to be created.
+    :param seed: The seed of the random generator.
+    :param detailed_solution: Flag on whether the detailed solution is to be created.
+    :param svg: Flag on whether the SVG of the decision tree is to be created.
+    :return: The exercise as JSON encoded HTTP response body, so that serving it needs no further work.
+    """
+    r.seed(seed)
+    classified_rows = g.create_classified_rows(columns, values, rows)[0]
+    df = pd.DataFrame(classified_rows[1:], columns=classified_rows[0])
+    output = s.decision_tree_calculation(df, detailed_solution)
+    exercise = {"profile": profile, "seed": seed, "columns": columns, "values": values, "rows": rows,
+                "csv": g.csv_text(classified_rows), "solution": "\n".join(output[2]) + "\n",
+                "dot": t.to_dot(output[1])}
+    if svg:
+        exercise["svg"] = t.to_svg(output[1])
+    return json.dumps(exercise).encode("utf-8")
+
+
+def lower_priority() -> None:
+    """
+    Lowers the priority of a worker process, so that creating exercises does not slow down answering requests.
+    """
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+class ExerciseService:
+    def __init__(self, profiles: dict[str, tuple[int, int, int]] | None = None, pool_size: int | None = None,
+                 max_bytes: int = 64 * 1024 * 1024, workers: int | None = None, detailed_solution: bool = False,
+                 svg: bool = True, first_seed: int | None = None):
+        """
+        Serves pre-generated and pre-solved exercises over HTTP. For every parameter profile a pool of exercises is
+        kept in memory and replenished in the background by worker processes, so that a request only takes an exercise
+        from the pool. The exercises are never written to disk.
+        :param profiles: The parameter profiles, see PROFILES.
+        :param pool_size: The maximum amount of exercises which are kept ready for every profile. The pools are only
+                limited by max_bytes when None.
+        :param max_bytes: The maximum size of all pooled exercises, every profile gets an equal share. No exercises are
+                created for a profile while its share is reached, unless requests are waiting. The default of 64 MB
+                holds about 4400 small, 2000 medium and 800 large exercises without SVGs (see PROFILES), so that a
+                burst of hundreds of requests is answered from the pools.
+        :param workers: The amount of worker processes. All CPUs but one are used when None, so that requests are
+                answered without delay while the pools are replenished.
+        :param detailed_solution: Flag on whether detailed solutions are to be created.
+        :param svg: Flag on whether SVGs of the decision trees are to be created (needs the graphviz executables).
+        :param first_seed: The seed of the first exercise. Every exercise gets its own seed. A random seed is used when
+                None, so that a restarted service does not hand out the same exercises again.
+        """
+        self.profiles = profiles if profiles is not None else PROFILES
+        self.pool_size = pool_size
+        self.max_bytes = max_bytes
+        self.detailed_solution = detailed_solution
+        self.svg = svg
+        if first_seed is None:
+            first_seed = int(r.SeedSequence().entropy % 2 ** 31)
+        self.seeds = itertools.count(first_seed)
+        self.pools: dict[str, deque[bytes]] = {name: deque() for name in self.profiles}  # the ready exercises
+        self.waiting: dict[str, deque[asyncio.Future]] = {name: deque() for name in self.profiles}  # requests which
+        # arrived while the pool was empty
+        self.creating: dict[str, int] = {name: 0 for name in self.profiles}  # exercises which are being created
+        self.pooled_bytes: dict[str, int] = {name: 0 for name in self.profiles}  # the size of the ready exercises
+        self.workers = workers
+        self.executor: ProcessPoolExecutor | None = None
+        self.changed: asyncio.Event | None = None  # set whenever an exercise is taken or created
+        self.replenish_task: asyncio.Task | None = None
+        self.create_tasks: set[asyncio.Task] = set()  # references to the running create tasks, so that they are not
+        # garbage collected before they are done
+
+    async def start(self) -> None:
+        """
+        Starts the worker processes and the replenishment of the pools.
+        """
+        if self.workers is None:
+            self.workers = max(1, (os.cpu_count() or 1) - 1)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=lower_priority)
+        self.changed = asyncio.Event()
+        self.replenish_task = asyncio.create_task(self.replenish())
+
+    async def stop(self) -> None:
+        """
+        Stops the replenishment of the pools and the worker processes.
+        """
+        self.replenish_task.cancel()
+        for task in self.create_tasks:
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def replenish(self) -> None:
+        """
+        Keeps all pools filled. Runs until the service is stopped.
+        """
+        while True:
+            self.changed.clear()
+            while sum(self.creating.values()) < self.workers:
+                names = [name for name in self.profiles if self.needs_exercise(name)]
+                if len(names) == 0:
+                    break
+                # the profile with the fewest ready exercises first, so that all pools are filled at the same time
+                name = min(names, key=lambda candidate: len(self.pools[candidate]) + self.creating[candidate] -
+                           len(self.waiting[candidate]))
+                self.creating[name] += 1
+                task = asyncio.create_task(self.create(name))
+                self.create_tasks.add(task)
+                task.add_done_callback(self.create_tasks.discard)
+            await self.changed.wait()
+
+    def needs_exercise(self, name: str) -> bool:
+        """
+        :param name: The name of the profile.
+        :return: True when requests are waiting for an exercise of the profile which is not being created yet, or when
+                the pool of the profile is neither full nor exceeds its share of max_bytes.
+        """
+        if len(self.waiting[name]) > self.creating[name]:
+            return True
+        if self.pool_size is not None and len(self.pools[name]) + self.creating[name] >= self.pool_size:
+            return False
+        return self.pooled_bytes[name] < self.max_bytes / len(self.profiles)
+
+    async def create(self, name: str) -> None:
+        """
+        Creates an exercise in a worker process and hands it to a waiting request or adds it to the pool.
+        :param name: The name of the profile.
+        """
+        columns, values, rows = self.profiles[name]
+        try:
+            try:
+                body = await asyncio.get_running_loop().run_in_executor(self.executor, create_exercise, name, columns,
+                                                                        values, rows, next(self.seeds),
+                                                                        self.detailed_solution, self.svg)
+            except Exception as e:
+                print("Creating an exercise failed: " + repr(e), file=sys.stderr)
+                self.drop_aborted_requests(name)
+                if len(self.waiting[name]) > 0:
+                    self.waiting[name].popleft().set_exception(e)
+                await asyncio.sleep(1)  # do not retry immediately when every exercise fails
+                return
+            self.drop_aborted_requests(name)
+            if len(self.waiting[name]) > 0:
+                self.waiting[name].popleft().set_result(body)
+            else:
+                self.pools[name].append(body)
+                self.pooled_bytes[name] += len(body)
+        finally:
+            self.creating[name] -= 1
+            self.changed.set()
+
+    def drop_aborted_requests(self, name: str) -> None:
+        """
+        Removes the waiting requests which were aborted or cancelled from the front of the queue.
+        :param name: The name of the profile.
+        """
+        while len(self.waiting[name]) > 0 and self.waiting[name][0].done():
+            self.waiting[name].popleft()
+
+    async def take(self, name: str) -> bytes:
+        """
+        Takes an exercise from the pool. Waits for the next created exercise when the pool is empty.
+        :param name: The name of the profile.
+        :return: The exercise as JSON encoded HTTP response body.
+        """
+        self.changed.set()
+        if len(self.pools[name]) > 0:
+            body = self.pools[name].popleft()
+            self.pooled_bytes[name] -= len(body)
+            return body
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[name].append(future)
+        return await future
+
+    async def respond(self, method: str, target: str) -> (HTTPStatus, bytes):
+        """
+        Creates the response for a request.
+        :param method: The HTTP method.
+        :param target: The request target.
+        :return: A tuple of the status and the JSON encoded body of the response.
+        """
+        path = target.split("?")[0].rstrip("/")
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, json.dumps({"error": "only GET is supported"}).encode("utf-8")
+        if path in ("", "/profiles"):
+            profiles = {}
+            for name, (columns, values, rows) in self.profiles.items():
+                profiles[name] = {"columns": columns, "values": values, "rows": rows,
+                                  "available": len(self.pools[name])}
+            return HTTPStatus.OK, json.dumps(profiles).encode("utf-8")
+        if path.startswith("/exercise/") and path[len("/exercise/"):] in self.profiles:
+            try:
+                return HTTPStatus.OK, await self.take(path[len("/exercise/"):])
+            except Exception as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": repr(e)}).encode("utf-8")
+        return HTTPStatus.NOT_FOUND, json.dumps({"error": "unknown path " + path}).encode("utf-8")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answers the HTTP requests of a connection. Connections are kept alive for HTTP/1.1.
+        :param reader: The reader of the connection.
+        :param writer: The writer of the connection.
+        """
+        try:
+            while True:
+                try:
+                    request = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = request.decode("latin-1").split("\r\n")
+                request_line = lines[0].split(" ")
+                headers = {}
+                for line in lines[1:]:
+                    if line.__contains__(":"):
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                if int(headers.get("content-length", "0")) > 0:  # request bodies are not used
+                    await reader.readexactly(int(headers["content-length"]))
+
+                if len(request_line) == 3:
+                    status, body = await self.respond(request_line[0], request_line[1])
+                    keep_alive = request_line[2] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                else:
+                    status, body = HTTPStatus.BAD_REQUEST, json.dumps({"error": "bad request"}).encode("utf-8")
+                    keep_alive = False
+                head = "HTTP/1.1 " + str(status.value) + " " + status.phrase + "\r\n" + \
+                       "Content-Type: application/json\r\n" + \
+                       "Content-Length: " + str(len(body)) + "\r\n" + \
+                       "Connection: " + ("keep-alive" if keep_alive else "close") + "\r\n\r\n"
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, **kwargs) -> None:
+    """
+    Starts the exercise service and serves requests until it is cancelled.
+    GET /profiles lists the profiles and how many exercises are ready, GET /exercise/<profile> returns an exercise as
+    JSON with the data set ("csv"), the solution ("solution"), the DOT source ("dot") and the SVG ("svg") of the tree.
+    :param host: The host name or address to listen on.
+    :param port: The port to listen on.
+    :param kwargs: The arguments of ExerciseService.
+    """
+    service = ExerciseService(**kwargs)
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def run(host: str = "127.0.0.1", port: int = 8000, **kwargs) -> None:
+    """
+    Runs the exercise service, see serve.
+    :param host: The host name or address to listen on.
+    :param port: The port to listen on.
+    :param kwargs: The arguments of ExerciseService.
+    """
+    asyncio.run(serve(host, port, **kwargs))
+
+
+if __name__ == '__main__':
+    run()
@@ -1,22 +1,33 @@
 import math
+import numpy as np
 import pandas as pd
-from graphviz import Source
 import csv
 import os
 import shutil
+import typing
+import dataset as d
+import tree as t
 
 
 def process_data(input_path: str, detailed_solution: bool, output_dir: str, svg: bool, graph_preview: bool, dot: bool,
-                 sub_folder: bool) -> None:
+                 sub_folder: bool, json: bool = False, numeric_columns: list[str] | None = None,
+                 progress: typing.Callable[[str], None] | None = None,
+                 output: typing.Callable[[str], None] | None = None) -> t.Tree | None:
     """
-    This method is called from the GUI. Process the input CSV file.
-    :param input_path: The path to the CSV file.
+    This method is called from the GUI. Process the input CSV file or binary data set file (see dataset.py).
+    :param input_path: The path to the CSV file or binary data set file.
     :param detailed_solution: Flag on whether a detailed solution file is to be created.
     :param output_dir: The directory where the output is to be stored.
     :param svg: Flag on whether an SVG file of the decision tree is to be created.
     :param graph_preview: Flag on whether the graph should be previewed when an SVG is to be created.
     :param dot: Flag on whether a DOT file is to be created.
     :param sub_folder: Flag on whether all output files are to be stored in an output folder in the output directory.
+    :param json: Flag on whether a JSON file of the decision tree is to be created.
+    :param numeric_columns: The columns which are split at thresholds, see read_data_file.
+    :param progress: Optional callback which receives a message whenever a new step starts.
+    :param output: Optional callback which receives the path of every new file or folder before it is written, so
+            that the output of a cancelled job can be removed. Files which already existed are not passed.
+    :return: The decision tree, None for invalid file paths.
     """
 
     # invalid file paths
@@ -24,13 +35,13 @@ def process_data(input_path: str, detailed_solution: bool, output_dir: str, svg:
         return
 
     # file names and file paths
-    input_file_name = os.path.basename(input_path)
+    file_name = os.path.splitext(os.path.basename(input_path))[0]  # the file name without the file ending
     if detailed_solution:
         solution_type = "extended"
     else:
         solution_type = "compact"
-    solution_path = output_dir + "/" + input_file_name[:-4] + "_" + solution_type + "_solution.txt"
-    dot_path = output_dir + "/" + input_file_name[:-3] + "dot"
+    solution_path = output_dir + "/" + file_name + "_" + solution_type + "_solution.txt"
+    dot_path = output_dir + "/" + file_name + ".dot"
 
     # corner case (Randfall): data is first created not in a sub folder and then in a sub folder:
     # In order to prevent data to be deleted from the not sub folder when being moved to the sub folder
@@ -44,27 +55,48 @@ def process_data(input_path: str, detailed_solution: bool, output_dir: str, svg:
     else:
         dot_already_existent = False
 
+    def announce(path: str) -> None:
+        """
+        Passes the path of a new file or folder to the output callback.
+        :param path: The path.
+        """
+        if output is not None and not os.path.exists(path):
+            output(path)
+
     # decision tree creation together with log and dot file
-    decision_tree_creation(input_path, detailed_solution, output_dir)
+    announce(solution_path)
+    announce(dot_path)
+    if progress is not None:
+        progress("Calculating the decision tree")
+    decision_tree = decision_tree_creation(input_path, detailed_solution, output_dir, numeric_columns)
 
     # svg file creation
+    if progress is not None and svg:
+        progress("Rendering the SVG file")
     if svg and not sub_folder:
-        dot_source = Source.from_file(dot_path, format='svg')
-        if graph_preview:
-            dot_source.view(dot_path[:-4], cleanup=True)
-        else:
-            dot_source.render(dot_path[:-4], cleanup=True)
+        announce(dot_path[:-4] + ".svg")
+        t.render_svg(decision_tree, dot_path[:-4], graph_preview)
+
+    # json file creation
+    if json and not sub_folder:
+        json_path = output_dir + "/" + file_name + ".json"
+        announce(json_path)
+        f = open(json_path, "w")
+        f.write(t.to_json(decision_tree))
+        f.close()
 
     # move all files to a sub folder when flag is true
     if sub_folder:
 
         # create directory
-        sub_folder_dir = input_path[:-4] + "_processed"
+        sub_folder_dir = os.path.splitext(input_path)[0] + "_processed"
+        announce(sub_folder_dir)
         if not os.path.exists(sub_folder_dir):
             os.mkdir(sub_folder_dir)
 
         # solution file
-        new_path_solution_file = sub_folder_dir + "/" + input_file_name[:-4] + "_" + solution_type + "_solution.txt"
+        new_path_solution_file = sub_folder_dir + "/" + file_name + "_" + solution_type + "_solution.txt"
+        announce(new_path_solution_file)
         if solution_already_existent:
             shutil.copy2(solution_path, new_path_solution_file)
         else:
@@ -72,16 +104,22 @@ def process_data(input_path: str, detailed_solution: bool, output_dir: str, svg:
 
         # svg file
         if svg:
-            dot_source = Source.from_file(dot_path, format='svg')
-            svg_path = sub_folder_dir + "/" + input_file_name[:-4]
-            if graph_preview:
-                dot_source.view(svg_path, cleanup=True)
-            else:
-                dot_source.render(svg_path)
+            svg_path = sub_folder_dir + "/" + file_name
+            announce(svg_path + ".svg")
+            t.render_svg(decision_tree, svg_path, graph_preview)
+
+        # json file
+        if json:
+            json_path = sub_folder_dir + "/" + file_name + ".json"
+            announce(json_path)
+            f = open(json_path, "w")
+            f.write(t.to_json(decision_tree))
+            f.close()
 
         # dot file
         if dot:
-            new_dot_path = sub_folder_dir + "/" + input_file_name[:-3] + "dot"
+            new_dot_path = sub_folder_dir + "/" + file_name + ".dot"
+            announce(new_dot_path)
             if dot_already_existent:
                 shutil.copy2(dot_path, new_dot_path)
             else:
@@ -93,25 +131,30 @@ def process_data(input_path: str, detailed_solution: bool, output_dir: str, svg:
 
     # Sometimes on Windows machines a second DOT file without the ".dot" file ending is created.
     # Delete this file if it exists.
-    trash_dot_file_path = output_dir + "/" + input_file_name[:-4]
+    trash_dot_file_path = output_dir + "/" + file_name
     if os.path.exists(trash_dot_file_path):
         os.remove(trash_dot_file_path)
 
+    return decision_tree
+
 
-def decision_tree_creation(input_path: str, detailed_solution_file: bool, output_dir: str) -> None:
+def decision_tree_creation(input_path: str, detailed_solution_file: bool, output_dir: str,
+                           numeric_columns: list[str] | None = None) -> t.Tree:
     """
     Creates the DOT file of the tree and a solution file.
     :param input_path: The path of the CSV file where the data is stored.
     :param detailed_solution_file: A boolean flag whether a detailed or compact solution file is to be created.
     :param output_dir: The directory where the DOT file and solution file is to be saved.
+    :param numeric_columns: The columns which are split at thresholds, see read_data_file.
+    :return: The decision tree.
     """
 
     # data management
-    df: pd.DataFrame = read_csv_file(input_path)
-    input_file_name = os.path.basename(input_path)
+    df: pd.DataFrame = read_data_file(input_path, numeric_columns)
+    file_name = os.path.splitext(os.path.basename(input_path))[0]  # the file name without the file ending
 
     # calculation
-    output = decision_tree_calculation(df, " ", detailed_solution_file)
+    output = decision_tree_calculation(df, detailed_solution_file)
 
     # create the solution file
     if detailed_solution_file:
@@ -119,34 +162,41 @@ def decision_tree_creation(input_path: str, detailed_solution_file: bool, output
     else:
         log_type = "compact"
     log = output[2]
-    log_path = output_dir + "/" + input_file_name[:-4] + "_" + log_type + "_solution.txt"
+    log_path = output_dir + "/" + file_name + "_" + log_type + "_solution.txt"
     f = open(log_path, "w")
     for line in log:
         f.write(line + "\n")
     f.close()
 
     # create the dot file for the tree
-    dot_text = output[1]
-    dot_path = output_dir + "/" + input_file_name[:-3] + "dot"
+    decision_tree = output[1]
+    dot_path = output_dir + "/" + file_name + ".dot"
     f = open(dot_path, "w")
-    f.write("digraph G {\n")
-    for line in dot_text:
-        f.write("\t" + line + "\n")
-    f.write("}")
+    f.write(t.to_dot(decision_tree))
     f.close()
+    return decision_tree
 
 
-def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
-                              detailed_approach: bool) -> (str, list[str], list[str]):
+def decision_tree_calculation(subset: pd.DataFrame, detailed_approach: bool, tree: t.Tree | None = None,
+                              parent: int = -1, edge_value: str | None = None,
+                              attribute_lists: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] | None = None,
+                              member: np.ndarray | None = None) -> (str, t.Tree, list[str]):
     """
     Recursively calculates the decision tree. No output files are generated yet.
+    Numeric attributes (columns with a numeric data type, see convert_numeric_columns) are split at the threshold with
+    the highest information gain into two child nodes. They are sorted only once for the whole tree (see presort) and
+    stay available for further splits.
     :param subset: The data for which the decision tree is to be calculated.
-    :param root_id_suffix: Necessary to distinguish between different splitting nodes with the same attribute name.
     :param detailed_approach: Boolean value for whether a detailed approach is to be documented.
             With detailed_approach = False a compact approach is documented.
+    :param tree: The tree to which the nodes of the subtree are added. A new tree is created when None.
+    :param parent: The id of the node to which the root of the subtree is attached, -1 for the root of the tree.
+    :param edge_value: The value on the edge from the parent node to the root of the subtree.
+    :param attribute_lists: The presorted numeric attributes of the subset, see presort. They are created when None.
+    :param member: The buffer for partitioning the attribute lists, see partition_attribute_lists. It is created
+            together with the attribute lists.
     :return: A tuple. The first element is the attribute which was used for splitting and the second element
-            is the input for the DOT file for the subtree with the splitting node as root. The third element is the
-            input for the approach file.
+            is the tree to which the subtree was added. The third element is the input for the approach file.
     """
     approach: list[str] = []  # initialization of the approach
     approaches: list[str] = []  # all approaches generated by recursively calculating subtrees appended one by
@@ -157,6 +207,14 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
     igs = []  # the information gains for all attributes
     cols: list[str] = subset.columns.values.tolist()  # get a list of all attribute names
     m = len(cols)  # amount of columns
+    thresholds: dict[str, float] = {}  # the best threshold for every numeric attribute
+
+    # sort the numeric attributes once for the whole tree
+    if attribute_lists is None:
+        if not subset.index.equals(pd.RangeIndex(n)):
+            subset = subset.reset_index(drop=True)  # the index is used as row id in the attribute lists
+        attribute_lists = presort(subset)
+        member = np.zeros(n, dtype=bool)
 
     approach.append("General information:")
     approach.append("\t|S| = " + str(n))
@@ -170,25 +228,26 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
     # duplicates
 
     # count how often every target attribute occurs
-    target_attr_vals_counts = target_attr_vals.value_counts()
+    target_attr_vals_counts = value_counts(target_attr_vals)
 
     if detailed_approach:
         approach.append("\tCount the occurrence of each target attribute value:")
         for i in range(len(target_attr_vals_counts)):
-            approach.append("\t\t" + str(target_attr_vals_counts.keys()[i]) + ": " + str(target_attr_vals_counts[i]))
+            approach.append("\t\t" + str(target_attr_vals_counts.keys()[i]) + ": " +
+                            str(target_attr_vals_counts.iloc[i]))
         approach.append("\tCalculate the entropy:")
     entropy_calc = ""  # here the calculation steps for the entropy are saved
 
     # calculate the entropy for all data points
     entropy: float = 0
     for i in range(len(target_attr_vals_unique)):  # For every distinct value of the target attribute ...
-        percentage = target_attr_vals_counts[i] / n  # ... calculate the percentage of its occurrence compared to all
-        # values ...
+        percentage = target_attr_vals_counts.iloc[i] / n  # ... calculate the percentage of its occurrence compared
+        # to all values ...
         approach_percentage = math.log2(percentage)  # ... and calculate log_2 of the percentage ...
         entropy -= percentage * approach_percentage  # ... to multiply the percentage with log_2(percentage)
         # and subtract the result from the current entropy.
-        entropy_calc += "(" + str(target_attr_vals_counts[i]) + "/" + str(n) + ")" + " * log_2(" + \
-                        str(target_attr_vals_counts[i]) + "/" + str(n) + ") + "  # extend our current entropy
+        entropy_calc += "(" + str(target_attr_vals_counts.iloc[i]) + "/" + str(n) + ")" + " * log_2(" + \
+                        str(target_attr_vals_counts.iloc[i]) + "/" + str(n) + ") + "  # extend our current entropy
         # calculation
 
     entropy_str = "Entropy(S) = " + entropy_calc[:-3] + " = " + str(round(entropy, 3))
@@ -208,14 +267,26 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
         vals: list[str] = subset.iloc[:, i].unique()  # ... and get all distinct values for the attribute.
 
         approach.append("\t" + str(cols[i]) + ":")
+        if cols[i] in attribute_lists:  # A numeric attribute has two values: both sides of its best threshold.
+            threshold = best_threshold(attribute_lists[cols[i]][1], attribute_lists[cols[i]][2])
+            if threshold is None:
+                igs.append(-math.inf)
+                approach.append("\t\tAll rows have the same value, the attribute cannot be split.")
+                continue
+            thresholds[cols[i]] = threshold
+            vals = threshold_values(cols[i], threshold)
+            if detailed_approach:
+                approach.append("\t\tSort the rows by the attribute and choose the threshold between two neighbouring "
+                                "values with the highest information gain: " + format_number(threshold))
         if detailed_approach:
             approach.append("\t\tCalculate the entropy of all values of the attribute:")
 
         # Calculate the entropy of all values of the attribute.
         for val in vals:  # For every value of the attribute ...
-            subset_subset = subset[subset[cols[i]] == val]  # ... we retrieve all rows which contain this value ...
+            subset_subset = subset[split_mask(subset, cols[i], val, thresholds)]  # ... we retrieve all rows which
+            # contain this value ...
             n_subset = len(subset_subset)  # ... and count the amount of rows for the given subset ...
-            target_attr_vals_counts_subset = subset_subset.iloc[:, m - 1].value_counts()  # ... and count how often
+            target_attr_vals_counts_subset = value_counts(subset_subset.iloc[:, m - 1])  # ... and count how often
             # every target attribute value occurs ...
             entropy_for_val = 0  # ... and initialize the entropy.
 
@@ -224,20 +295,20 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
                 approach.append("\t\t\t\tCount the occurrence of each target attribute value:")
                 for j in range(len(target_attr_vals_counts_subset)):
                     approach.append("\t\t\t\t\t" + str(target_attr_vals_counts_subset.keys()[j]) + ": " +
-                                    str(target_attr_vals_counts_subset[j]))
+                                    str(target_attr_vals_counts_subset.iloc[j]))
                 approach.append("\t\t\t\tCalculate the entropy:")
             entropy_calc = ""  # here the calculation steps for the entropy are saved
 
             # Calculate the entropy for the given value of the attribute.
             for j in range(len(target_attr_vals_counts_subset)):  # For every value of the target attribute ...
-                percentage = target_attr_vals_counts_subset[j] / n_subset  # ... we calculate the percentage it makes
-                # out of all values. ...
+                percentage = target_attr_vals_counts_subset.iloc[j] / n_subset  # ... we calculate the percentage it
+                # makes out of all values. ...
                 approach_percentage = math.log2(percentage)  # ... and calculate log_2(percentage) ...
                 entropy_for_val -= percentage * approach_percentage  # ... and subtract percentage *
                 # log_percentage from the current entropy.
-                entropy_calc += "(" + str(target_attr_vals_counts_subset[j]) + "/" + str(n_subset) + ")" + " * log_2(" \
-                                + str(target_attr_vals_counts_subset[j]) + "/" + str(n_subset) + ") + "  # extend our
-                # current entropy calculation
+                entropy_calc += "(" + str(target_attr_vals_counts_subset.iloc[j]) + "/" + str(n_subset) + ")" + \
+                                " * log_2(" + str(target_attr_vals_counts_subset.iloc[j]) + "/" + str(n_subset) + \
+                                ") + "  # extend our current entropy calculation
 
             # append our calculated values to our lists
             entropies.append(entropy_for_val)
@@ -274,52 +345,73 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
         if igs[i] > best_ig:
             best_index = i
             best_ig = igs[i]
+    if best_index == -1:  # no attribute can be split, e.g. only numeric attributes with a single value are left
+        child_node_name = target_attr_vals_counts.keys()[0]  # the target attribute value with the most rows
+        if tree is None:
+            tree = t.Tree()
+        tree.add_node(parent, child_node_name, None, edge_value, class_counts(target_attr_vals))
+        approach.append("There are no attributes which can be split. --> Create " + str(child_node_name) +
+                        " as a leaf.")
+        return child_node_name, tree, approach
     split_attr_name = cols[best_index]
 
     if detailed_approach:
         approach.append("Determine the best attribute for splitting: ")
     igs_comma_separated = ""  # all information gains separated by commas
-    for col in cols[:-1]:
-        igs_comma_separated += "Gain(S," + str(col) + "), "
+    for i in range(m - 1):
+        if igs[i] > -math.inf:  # attributes which cannot be split are left out
+            igs_comma_separated += "Gain(S," + str(cols[i]) + "), "
     max_str = "max{" + igs_comma_separated[:-2] + "} = Gain(S," + str(split_attr_name) + ") --> split at " \
               + str(split_attr_name)
     if detailed_approach:
         approach.append("\t" + max_str)
         approach.append("Create the subtree:")
         approach.append("\tCreate the node " + str(split_attr_name))
-        approach.append("\tCreate a child node for every value of " + str(split_attr_name) + ":")
+        if split_attr_name in thresholds:
+            approach.append("\tCreate a child node for both sides of the threshold of " + str(split_attr_name) + ":")
+        else:
+            approach.append("\tCreate a child node for every value of " + str(split_attr_name) + ":")
     else:
         approach.append(max_str)
 
     # Create the graph data.
-    dot = []  # the content of the DOT file
-    split_attr_id = split_attr_name + root_id_suffix  # the id of the split node
-    vals: list[str] = subset.iloc[:, best_index].unique()  # get all values of the split attribute
-    id_suffix = 0  # the suffix which is added to the id of newly created nodes
+    if tree is None:
+        tree = t.Tree()
+    split_node = tree.add_node(parent, split_attr_name, split_attr_name, edge_value, class_counts(target_attr_vals),
+                               thresholds.get(split_attr_name))  # the id of the split node
+    if split_attr_name in thresholds:
+        vals = threshold_values(split_attr_name, thresholds[split_attr_name])
+        remaining_attrs = cols[:-1]  # numeric attributes can be split again at another threshold
+    else:
+        vals: list[str] = subset.iloc[:, best_index].unique()  # get all values of the split attribute
+        remaining_attrs = [col for col in cols[:-1] if col != split_attr_name]
 
     for val in vals:  # Iterate over all values of the split attribute.
 
         if detailed_approach:
             approach.append("\t\t" + str(val) + ":")
 
-        val_subset = subset[subset[split_attr_name] == val]  # all rows which have val for the split attribute
+        val_subset = subset[split_mask(subset, split_attr_name, val, thresholds)]  # all rows which have val for the
+        # split attribute
+        val_attribute_lists = partition_attribute_lists(attribute_lists, val_subset.index.to_numpy(), member)
         amount_of_different_target_attr_vals = len(val_subset.iloc[:, m - 1].unique())  # How many distinct target
         # attribute values do we have?
         if amount_of_different_target_attr_vals == 1:  # stops the recursion when there is only one target attribute
             # value left (i. e. when we have perfect entropy)
             child_node_name = val_subset.iloc[:, m - 1].unique()[0]  # The remaining target attribute value.
-            child_node_id = child_node_name + root_id_suffix + str(id_suffix)  # the id of the node which represents the
-            # target attribute value
+            tree.add_node(split_node, child_node_name, None, val, class_counts(val_subset.iloc[:, m - 1]))  # the node
+            # which represents the target attribute value
 
             if detailed_approach:
                 approach.append("\t\t\tThere is only target attribute value left (i. e. we have perfect entropy). --> "
                                 "Create " + str(child_node_name) + " as the child node.")
 
-        elif m == 2:  # stops the recursion if there are no other split attributes left, and we have no perfect entropy
-            child_node_name = val_subset.iloc[:, m - 1].value_counts().keys()[0]  # the target attribute value with the
+        elif not has_split_attributes(remaining_attrs, val_attribute_lists):  # stops the recursion if there are no
+            # other split attributes left, and we have no perfect entropy
+            child_node_name = value_counts(val_subset.iloc[:, m - 1]).keys()[0]  # the target attribute value with the
             # most rows
-            child_node_id = child_node_name + root_id_suffix + str(id_suffix)  # the id of the node which represents the
-            # target attribute value with the most rows
+            tree.add_node(split_node, child_node_name, None, val, class_counts(val_subset.iloc[:, m - 1]))  # the node
+            # which represents the target attribute value with the most rows
 
             if detailed_approach:
                 approach.append("\t\t\tThere is more than one target attribute values left but we have no more "
@@ -328,13 +420,13 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
                                                                                                       "node.")
 
         else:  # keep splitting attributes
-            val_subset = val_subset.drop(columns=[split_attr_name])  # remove the split attribute column from the subset
-            return_val = decision_tree_calculation(val_subset, root_id_suffix + str(id_suffix),
-                                                   detailed_approach)  # recursively calculate the decision
-            # tree with the split attribute as root node
+            if split_attr_name not in thresholds:
+                val_subset = val_subset.drop(columns=[split_attr_name])  # remove the split attribute column from the
+                # subset
+            return_val = decision_tree_calculation(val_subset, detailed_approach, tree, split_node, val,
+                                                   val_attribute_lists, member)  # recursively calculate the
+            # decision tree with the split attribute as root node, its nodes are added to the tree
             child_node_name = return_val[0]  # the split attribute one level deeper in the tree
-            child_node_id = child_node_name + root_id_suffix + str(id_suffix)
-            dot += return_val[1]  # the dot file entries in the subtree
 
             if detailed_approach:
                 approaches.append("\n\nThis is the approach for the creation of the subtree with " +
@@ -353,14 +445,315 @@ def decision_tree_calculation(subset: pd.DataFrame, root_id_suffix: str,
             approach.append("\t\t\tCreate an edge from " + str(split_attr_name) + " to " + str(child_node_name)
                             + " with the label " + str(val) + ".")
 
-        dot.append("\"" + child_node_id + "\" [label=\"" + child_node_name + "\"]")  # the dot file entry for the child
-        # node
-        dot.append("\"" + split_attr_id + "\" -> \"" + child_node_id + "\" [label=\"" + val + "\"]")  # the dot file
-        # entry for the edge between the split attribute and child node
-        id_suffix += 1
+    return split_attr_name, tree, (approach + approaches)  # The name of the split attribute, the tree and the
+    # approaches of all subtrees so far are returned.
+
+
+def presort(df: pd.DataFrame) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Sorts every numeric attribute once, like the attribute lists of SLIQ and SPRINT. When the rows are split, the lists
+    are only partitioned (see partition_attribute_lists) and stay sorted, so no attribute is sorted again.
+    :param df: The data. Its index must hold the row numbers 0, 1, 2, ...
+    :return: A dictionary of numeric attribute (key) and attribute list (value). An attribute list is a tuple of the
+            row ids, the values and the target attribute codes of all rows, sorted by value.
+    """
+    classes = pd.factorize(df.iloc[:, -1])[0]
+    attribute_lists = {}
+    for col in df.columns[:-1]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            values = df[col].to_numpy()
+            row_ids = np.argsort(values, kind='stable')
+            attribute_lists[col] = (row_ids, values[row_ids], classes[row_ids])
+    return attribute_lists
+
+
+def partition_attribute_lists(attribute_lists: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]], rows: np.ndarray,
+                              member: np.ndarray) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Keeps only the given rows in the attribute lists. The lists stay sorted, which takes linear time in the amount of
+    rows of the lists.
+    :param attribute_lists: The attribute lists, see presort.
+    :param rows: The ids of the rows to keep.
+    :param member: A boolean buffer with an entry for every row id of the whole data set, which is False everywhere.
+            It is allocated only once per tree, only the entries of the rows are set and reset again.
+    :return: The attribute lists of the rows.
+    """
+    if len(attribute_lists) == 0:
+        return attribute_lists
+    member[rows] = True
+    partitioned = {}
+    for col, (row_ids, values, classes) in attribute_lists.items():
+        keep = member[row_ids]
+        partitioned[col] = (row_ids[keep], values[keep], classes[keep])
+    member[rows] = False
+    return partitioned
+
+
+def best_threshold(values: np.ndarray, classes: np.ndarray) -> float | None:
+    """
+    Finds the threshold of a numeric attribute with the highest information gain in one pass over its sorted values.
+    Only the midpoints between two different neighbouring values are candidates. Of equally good thresholds the
+    smallest is chosen.
+    :param values: The sorted values of the attribute, see presort.
+    :param classes: The target attribute codes in the same order.
+    :return: The threshold, None when all values are equal.
+    """
+    splits = np.flatnonzero(values[:-1] != values[1:])  # the positions after which the rows can be split
+    if len(splits) == 0:
+        return None
+    n = len(values)
+    one_hot = np.zeros((n, int(classes.max()) + 1), dtype=np.int64)
+    one_hot[np.arange(n), classes] = 1
+    left = np.cumsum(one_hot, axis=0)[splits]  # the class counts of the rows <= threshold for every split
+    right = one_hot.sum(axis=0) - left  # the class counts of the rows > threshold
+    n_left = splits + 1
+    weighted_entropies = n_left * entropies(left, n_left) + (n - n_left) * entropies(right, n - n_left)
+    best = splits[np.argmin(weighted_entropies)]  # the lowest weighted entropy has the highest information gain
+    return float((values[best] + values[best + 1]) / 2)
+
+
+def entropies(counts: np.ndarray, ns: np.ndarray) -> np.ndarray:
+    """
+    Calculate several entropies at once.
+    :param counts: A row of class counts for every entropy.
+    :param ns: The amount of rows for every entropy.
+    :return: The entropies.
+    """
+    percentages = counts / ns[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -np.sum(np.where(percentages > 0, percentages * np.log2(percentages), 0), axis=1)
+
+
+def threshold_values(col: str, threshold: float) -> list[str]:
+    """
+    :param col: The numeric attribute.
+    :param threshold: The threshold.
+    :return: The values of both sides of the threshold, which are used as edge labels, e.g. "col4 <= 37.5".
+    """
+    return [str(col) + " <= " + format_number(threshold), str(col) + " > " + format_number(threshold)]
+
+
+def split_mask(subset: pd.DataFrame, col: str, val: str, thresholds: dict[str, float]) -> pd.Series:
+    """
+    :param subset: The data.
+    :param col: The split attribute.
+    :param val: The value of the attribute, for numeric attributes one of threshold_values.
+    :param thresholds: The thresholds of the numeric attributes.
+    :return: Which rows have the value.
+    """
+    if col in thresholds:
+        if val == threshold_values(col, thresholds[col])[0]:
+            return subset[col] <= thresholds[col]
+        return subset[col] > thresholds[col]
+    return subset[col] == val
+
+
+def has_split_attributes(attrs: list, attribute_lists: dict) -> bool:
+    """
+    :param attrs: The remaining attributes.
+    :param attribute_lists: The attribute lists of the numeric attributes, see presort.
+    :return: True when one of the attributes can be split: it is not numeric or not all of its values are equal.
+    """
+    for attr in attrs:
+        if attr not in attribute_lists or attribute_lists[attr][1][0] != attribute_lists[attr][1][-1]:
+            return True
+    return False
+
+
+def format_number(number: float) -> str:
+    """
+    :param number: The number.
+    :return: The number without decimal places when it is a whole number.
+    """
+    if float(number).is_integer():
+        return str(int(number))
+    return str(float(number))
+
 
-    return split_attr_name, dot, (approach + approaches)  # The name of the split attribute, all dot file entries and
-    # the approaches of all subtrees so far are returned.
+def class_counts(target_attr_vals: pd.Series) -> dict[str, int]:
+    """
+    Count how often every target attribute value occurs.
+    :param target_attr_vals: The values of the target attribute.
+    :return: A dictionary of target attribute value (key) and amount of rows (value).
+    """
+    return {str(val): int(count) for val, count in value_counts(target_attr_vals).items()}
+
+
+def value_counts(vals: pd.Series) -> pd.Series:
+    """
+    Count how often every value occurs, most frequent first. Values with the same count keep the order of their first
+    occurrence. Unlike pd.Series.value_counts, categories which do not occur in a categorical column are left out.
+    :param vals: The values.
+    :return: The counts with the values as index.
+    """
+    codes, uniques = pd.factorize(vals)
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(uniques)), index=list(uniques), name="count")
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+def tree_shape(df: pd.DataFrame) -> (int, int):
+    """
+    Calculates only the shape of the decision tree which decision_tree_calculation would create for the data. No text
+    and no graph data is generated, only class counts are used, which makes this fast enough to check many candidate
+    data sets. The attribute values are visited in the same order as in decision_tree_calculation, so that the same
+    split attributes and thresholds are chosen.
+    :param df: The data for which the shape of the decision tree is to be calculated.
+    :return: A tuple. The first element is the depth of the tree (the amount of edges on the longest path from the
+            root to a leaf) and the second element is the amount of leaves.
+    """
+    codes = np.empty((len(df.index), len(df.columns)), dtype=np.int64)  # every value is replaced by an integer code
+    numeric_values = {}  # the values of the numeric attributes by column index
+    for i in range(len(df.columns)):
+        codes[:, i] = pd.factorize(df.iloc[:, i])[0]
+        if i < len(df.columns) - 1 and pd.api.types.is_numeric_dtype(df.iloc[:, i]):
+            numeric_values[i] = df.iloc[:, i].to_numpy()
+    attribute_lists = {}
+    for i, values in numeric_values.items():
+        row_ids = np.argsort(values, kind='stable')
+        attribute_lists[i] = (row_ids, values[row_ids], codes[row_ids, -1])
+    return subtree_shape(codes, numeric_values, np.arange(len(df.index)), list(range(len(df.columns) - 1)),
+                         attribute_lists, np.zeros(len(df.index), dtype=bool))
+
+
+def subtree_shape(codes: np.ndarray, numeric_values: dict[int, np.ndarray], rows: np.ndarray, attrs: list[int],
+                  attribute_lists: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]],
+                  member: np.ndarray) -> (int, int):
+    """
+    Recursively calculates the shape of the subtree for the given rows.
+    :param codes: The integer codes of all values. The last column holds the target attribute.
+    :param numeric_values: The values of the numeric attributes by column index.
+    :param rows: The indices of the rows of the subset.
+    :param attrs: The indices of the remaining split attributes.
+    :param attribute_lists: The attribute lists of the numeric attributes for the rows, see presort.
+    :param member: The buffer for partitioning the attribute lists, see partition_attribute_lists.
+    :return: A tuple of the depth and the amount of leaves of the subtree.
+    """
+    n = len(rows)
+    target = codes[rows, -1]
+    entropy = counts_entropy(ordered_counts(target), n)
+
+    # get the best split attribute
+    best_attr = -1
+    best_ig = -math.inf
+    best_vals = []
+    best_col = None
+    for attr in attrs:
+        if attr in attribute_lists:  # the values of numeric attributes are both sides of the threshold
+            threshold = best_threshold(attribute_lists[attr][1], attribute_lists[attr][2])
+            if threshold is None:
+                continue
+            col = numeric_values[attr][rows] <= threshold
+            vals = [True, False]
+        else:
+            col = codes[rows, attr]
+            vals = ordered_values(col)
+        entropies_sum = 0
+        for val in vals:
+            n_subset = int(np.count_nonzero(col == val))
+            entropies_sum += (n_subset / n) * counts_entropy(ordered_counts(target[col == val]), n_subset)
+        ig = entropy - entropies_sum
+        if ig > best_ig:
+            best_attr = attr
+            best_ig = ig
+            best_vals = vals
+            best_col = col
+    if best_attr == -1:  # no attribute can be split, the subtree is a leaf like in decision_tree_calculation
+        return 0, 1
+
+    # create the child nodes
+    depth = 0
+    leaves = 0
+    remaining_attrs = [attr for attr in attrs if attr != best_attr or attr in attribute_lists]
+    for val in best_vals:
+        val_rows = rows[best_col == val]
+        val_attribute_lists = partition_attribute_lists(attribute_lists, val_rows, member)
+        if not has_split_attributes(remaining_attrs, val_attribute_lists) or \
+                np.all(codes[val_rows, -1] == codes[val_rows[0], -1]):
+            child_depth, child_leaves = 0, 1
+        else:
+            child_depth, child_leaves = subtree_shape(codes, numeric_values, val_rows, remaining_attrs,
+                                                      val_attribute_lists, member)
+        depth = max(depth, child_depth + 1)
+        leaves += child_leaves
+    return depth, leaves
+
+
+def ordered_values(col: np.ndarray) -> list[int]:
+    """
+    Get the distinct codes of a column in the order of their first occurrence, like pandas' unique() does.
+    :param col: The codes of the column.
+    :return: The distinct codes.
+    """
+    vals, first = np.unique(col, return_index=True)
+    return vals[np.argsort(first)].tolist()
+
+
+def ordered_counts(col: np.ndarray) -> list[int]:
+    """
+    Count how often every code occurs, most frequent first, like pandas' value_counts() does.
+    :param col: The codes of the column.
+    :return: The counts of all codes which occur in the column.
+    """
+    counts = np.bincount(col)
+    counts = counts[counts > 0]
+    return (-np.sort(-counts, kind='stable')).tolist()
+
+
+def counts_entropy(counts: list[int], n: int) -> float:
+    """
+    Calculate the entropy in the same way as decision_tree_calculation does.
+    :param counts: How often every target attribute value occurs.
+    :param n: The amount of rows.
+    :return: The entropy.
+    """
+    entropy = 0
+    for count in counts:
+        percentage = count / n
+        entropy -= percentage * math.log2(percentage)
+    return entropy
+
+
+def read_data_file(path: str, numeric_columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read data from a CSV file or a binary data set file (see dataset.py).
+    :param path: The file path.
+    :param numeric_columns: The columns whose values are numbers, which are split at thresholds. All other columns are
+    categorical, even when their values are numbers. The numeric columns stored in a binary data set file are used when
+    None.
+    :return: The dataframe of the file. The numeric columns are converted (see convert_numeric_columns), the other
+    columns of binary data set files are categorical columns which use the memory-mapped codes of the file.
+    """
+    if path.endswith(d.FILE_ENDING):
+        dataset = d.read_dataset(path)
+        if numeric_columns is None:
+            numeric_columns = dataset.numeric_columns
+        return convert_numeric_columns(d.to_data_frame(dataset), numeric_columns)
+    return convert_numeric_columns(read_csv_file(path), numeric_columns if numeric_columns is not None else [])
+
+
+def convert_numeric_columns(df: pd.DataFrame, numeric_columns: list[str]) -> pd.DataFrame:
+    """
+    Converts the given attribute columns into numeric columns, so that decision_tree_calculation splits them at a
+    threshold.
+    :param df: The data.
+    :param numeric_columns: The columns to convert.
+    :return: The data with the converted columns.
+    :raises ValueError: When a column does not exist, is the target attribute or has a value which is no number.
+    """
+    for col in numeric_columns:
+        if col not in df.columns[:-1]:
+            raise ValueError("the numeric column " + str(col) + " is no attribute of the data")
+        if isinstance(df[col].dtype, pd.CategoricalDtype):  # convert only the categories, not every value
+            categories = pd.to_numeric(pd.Series(df[col].cat.categories), errors='coerce')
+            if categories.isna().any():
+                raise ValueError("the numeric column " + str(col) + " has values which are no numbers")
+            df[col] = categories.to_numpy()[df[col].cat.codes]
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            values = pd.to_numeric(df[col], errors='coerce')
+            if values.isna().any():
+                raise ValueError("the numeric column " + str(col) + " has values which are no numbers")
+            df[col] = values
+    return df
 
 
 def read_csv_file(path: str) -> pd.DataFrame:
@@ -0,0 +1,228 @@
+import json
+import re
+from collections import deque
+from graphviz import Source
+
+# a node id or attribute value in the DOT format: a quoted string or a word
+DOT_ID = r'"(?:[^"\\]|\\.)*"|[^\s\[\]{};=,"-]+'
+DOT_STATEMENT = re.compile(r'(' + DOT_ID + r')\s*(?:->\s*(' + DOT_ID + r')\s*)?(\[[^\]]*\])?')
+DOT_LABEL = re.compile(r'\blabel\s*=\s*(' + DOT_ID + r')')
+
+
+class Tree:
+    __slots__ = ("parents", "labels", "attributes", "edge_values", "class_counts", "children", "thresholds")
+
+    def __init__(self):
+        """
+        A decision tree stored as a node table. Every node is identified by an integer id, which is the index of the
+        node in all lists. The root has the id 0.
+        """
+        self.parents: list[int] = []  # the id of the parent node, -1 for the root
+        self.labels: list[str] = []  # the split attribute for inner nodes, the target attribute value for leaves
+        self.attributes: list[str | None] = []  # the split attribute, None for leaves
+        self.edge_values: list[str | None] = []  # the value on the edge from the parent node, None for the root
+        self.class_counts: list[dict[str, int]] = []  # how often every target attribute value occurs in the node
+        self.children: list[list[int]] = []  # the ids of the child nodes
+        self.thresholds: list[float | None] = []  # the threshold of numeric split attributes, None for other nodes.
+        # The first child holds the rows with values <= threshold, the second child the others.
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add_node(self, parent: int, label: str, attribute: str | None, edge_value: str | None,
+                 class_counts: dict[str, int], threshold: float | None = None) -> int:
+        """
+        Adds a node to the tree.
+        :param parent: The id of the parent node, -1 for the root.
+        :param label: The split attribute for inner nodes, the target attribute value for leaves.
+        :param attribute: The split attribute, None for leaves.
+        :param edge_value: The value on the edge from the parent node, None for the root.
+        :param class_counts: How often every target attribute value occurs in the node.
+        :param threshold: The threshold of a numeric split attribute, None for other nodes.
+        :return: The id of the new node.
+        """
+        node = len(self.parents)
+        self.parents.append(parent)
+        self.labels.append(label)
+        self.attributes.append(attribute)
+        self.edge_values.append(edge_value)
+        self.class_counts.append(class_counts)
+        self.children.append([])
+        self.thresholds.append(threshold)
+        if parent >= 0:
+            self.children[parent].append(node)
+        return node
+
+    def is_leaf(self, node: int) -> bool:
+        """
+        :param node: The id of the node.
+        :return: True when the node is a leaf.
+        """
+        return self.attributes[node] is None
+
+    def depth(self) -> int:
+        """
+        :return: The amount of edges on the longest path from the root to a leaf.
+        """
+        depths = [0] * len(self)
+        for node in range(1, len(self)):  # parents always have smaller ids than their children
+            depths[node] = depths[self.parents[node]] + 1
+        return max(depths, default=0)
+
+    def leaves(self) -> list[int]:
+        """
+        :return: The ids of all leaves.
+        """
+        return [node for node in range(len(self)) if self.is_leaf(node)]
+
+
+def to_dot(tree: Tree) -> str:
+    """
+    Serializes the tree in the DOT format.
+    :param tree: The tree.
+    :return: The content of the DOT file.
+    """
+    lines = ["digraph G {"]
+    for node in range(len(tree)):
+        lines.append("\t\"" + str(node) + "\" [label=\"" + escape(tree.labels[node]) + "\"]")
+        if tree.parents[node] >= 0:
+            lines.append("\t\"" + str(tree.parents[node]) + "\" -> \"" + str(node) + "\" [label=\"" +
+                         escape(tree.edge_values[node]) + "\"]")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def to_json(tree: Tree) -> str:
+    """
+    Serializes the tree as JSON. Every node of the node table is an object in the list "nodes".
+    :param tree: The tree.
+    :return: The content of the JSON file.
+    """
+    nodes = []
+    for node in range(len(tree)):
+        nodes.append({"id": node, "parent": tree.parents[node], "label": tree.labels[node],
+                      "attribute": tree.attributes[node], "edge_value": tree.edge_values[node],
+                      "class_counts": tree.class_counts[node], "children": tree.children[node],
+                      "threshold": tree.thresholds[node]})
+    return json.dumps({"nodes": nodes}, indent=1)
+
+
+def from_json(text: str) -> Tree:
+    """
+    Reads a tree which was serialized with to_json. Only "parent" and "label" are required for every node, so that
+    trees written by hand can be read as well: a missing "edge_value" is None, missing "class_counts" are empty, and a
+    missing "attribute" is the label of nodes with children and None for leaves, like in from_dot.
+    :param text: The content of the JSON file.
+    :return: The tree.
+    :raises ValueError: When the content is no tree in the format of to_json.
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict) or not isinstance(data.get("nodes"), list):
+        raise ValueError('a tree needs the form {"nodes": [...]}')
+    nodes = data["nodes"]
+    for i in range(len(nodes)):
+        if not isinstance(nodes[i], dict) or "parent" not in nodes[i] or "label" not in nodes[i]:
+            raise ValueError("every node must be an object with a parent and a label")
+        parent = nodes[i]["parent"]
+        if not isinstance(parent, int) or isinstance(parent, bool) or not -1 <= parent < i or \
+                (parent == -1) != (i == 0):
+            raise ValueError("the node " + str(i) + " has the invalid parent " + repr(parent))
+    parents = {node["parent"] for node in nodes}  # the nodes which have children
+
+    tree = Tree()
+    for i in range(len(nodes)):
+        node = nodes[i]
+        attribute = node["attribute"] if "attribute" in node else (node["label"] if i in parents else None)
+        tree.add_node(node["parent"], node["label"], attribute, node.get("edge_value"), node.get("class_counts") or {},
+                      node.get("threshold"))
+    return tree
+
+
+def from_dot(text: str) -> Tree:
+    """
+    Reads a tree from a DOT file. Besides the files of to_dot, any digraph with one root, node labels and edge labels
+    can be read. Nodes without a label are labelled with their id like in graphviz, nodes without edges are ignored.
+    The nodes get new ids in breadth first order, the class counts and thresholds are unknown and left empty.
+    :param text: The content of the DOT file.
+    :return: The tree.
+    """
+    body = text[text.index("{") + 1:text.rindex("}")]
+    labels: dict[str, str] = {}  # node id -> label
+    edges: dict[str, list[tuple[str, str]]] = {}  # node id -> list of (child node id, edge label)
+    children: set[str] = set()
+    for statement in re.split(r'[;\n]', body):
+        match = DOT_STATEMENT.fullmatch(statement.strip())
+        if match is None or match.group(1) in ("graph", "node", "edge"):
+            continue
+        label = DOT_LABEL.search(match.group(3) or "")
+        if match.group(2) is None:  # node statement
+            labels[unquote(match.group(1))] = unquote(label.group(1)) if label is not None else unquote(match.group(1))
+        else:  # edge statement
+            parent, child = unquote(match.group(1)), unquote(match.group(2))
+            edges.setdefault(parent, []).append((child, unquote(label.group(1)) if label is not None else ""))
+            children.add(child)
+            labels.setdefault(parent, parent)
+            labels.setdefault(child, child)
+
+    roots = [node for node in labels if node not in children]
+    if len(labels) > 1:
+        roots = [node for node in roots if node in edges]  # nodes without any edges are ignored
+    if len(roots) != 1:
+        raise ValueError("a tree needs exactly one root, found " + str(len(roots)))
+
+    tree = Tree()
+    queue = deque([(roots[0], -1, None)])  # (node id in the DOT file, parent id in the tree, edge label)
+    visited = set()
+    while len(queue) > 0:
+        node, parent, edge_value = queue.popleft()
+        if node in visited:
+            raise ValueError("the node " + node + " has more than one parent")
+        visited.add(node)
+        attribute = labels[node] if node in edges else None
+        new_node = tree.add_node(parent, labels[node], attribute, edge_value, {})
+        for child, edge_label in edges.get(node, []):
+            queue.append((child, new_node, edge_label))
+    return tree
+
+
+def unquote(text: str) -> str:
+    """
+    Removes the quotes of a quoted string of the DOT format.
+    :param text: The string.
+    :return: The string without quotes and escape characters.
+    """
+    if text.startswith("\"") and text.endswith("\"") and len(text) >= 2:
+        return re.sub(r'\\(.)', r'\1', text[1:-1])
+    return text
+
+
+def render_svg(tree: Tree, path: str, view: bool) -> None:
+    """
+    Renders the tree as an SVG file with graphviz.
+    :param tree: The tree.
+    :param path: The path of the SVG file without the file ending.
+    :param view: Flag on whether the SVG file is to be opened after rendering.
+    """
+    source = Source(to_dot(tree), format='svg')
+    if view:
+        source.view(path, cleanup=True)
+    else:
+        source.render(path, cleanup=True)
+
+
+def to_svg(tree: Tree) -> str:
+    """
+    Renders the tree as SVG with graphviz without creating any files.
+    :param tree: The tree.
+    :return: The content of the SVG file.
+    """
+    return Source(to_dot(tree)).pipe(format='svg', encoding='utf-8')
+
+
+def escape(text: str) -> str:
+    """
+    Escapes a label for the DOT format.
+    :param text: The label.
+    :return: The escaped label.
+    """
+    return str(text).replace("\\", "\\\\").replace("\"", "\\\"")